@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from aqua_marketkeys_tracker.marketkeys.cache import bump_dataset_version
 from aqua_marketkeys_tracker.marketkeys.models import MarketKey
 
 
@@ -8,3 +9,15 @@ class MarketKeyAdmin(admin.ModelAdmin):
     list_display = ['account_id', 'asset1', 'asset2', 'is_active', 'locked_at']
     readonly_fields = ['account_id', 'downvote_account_id', 'locked_at']
     ordering = ['locked_at']
+
+    def save_model(self, request, obj, form, change):
+        super(MarketKeyAdmin, self).save_model(request, obj, form, change)
+        bump_dataset_version()
+
+    def delete_model(self, request, obj):
+        super(MarketKeyAdmin, self).delete_model(request, obj)
+        bump_dataset_version()
+
+    def delete_queryset(self, request, queryset):
+        super(MarketKeyAdmin, self).delete_queryset(request, queryset)
+        bump_dataset_version()
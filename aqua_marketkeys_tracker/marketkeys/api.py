@@ -9,19 +9,47 @@ from rest_framework.permissions import AllowAny
 
 from stellar_sdk import Asset
 
+from aqua_marketkeys_tracker.marketkeys.cache import CachedResponseMixin
 from aqua_marketkeys_tracker.marketkeys.models import MarketKey
-from aqua_marketkeys_tracker.marketkeys.pagination import MarketKeyPagination
+from aqua_marketkeys_tracker.marketkeys.pagination import MarketKeyCursorPagination, MarketKeyPagination
 from aqua_marketkeys_tracker.marketkeys.pair import MarketPair
-from aqua_marketkeys_tracker.marketkeys.serializers import MarketKeySerializer
+from aqua_marketkeys_tracker.marketkeys.serializers import MarketKeyRowSerializer, MarketKeySerializer
+from aqua_marketkeys_tracker.marketkeys.snapshot import SnapshotResponseMixin
 from aqua_marketkeys_tracker.utils.drf.filters import MultiGetFilterBackend
 from aqua_marketkeys_tracker.utils.stellar.urls import AssetStringConverter
 
 
-class BaseMarketKeyView(GenericAPIView):
-    queryset = MarketKey.objects.order_by('id').filter_active().select_related('asset1', 'asset2')
+class BaseMarketKeyView(CachedResponseMixin, GenericAPIView):
+    queryset = (
+        MarketKey.objects.order_by('id').filter_active().select_related('asset1', 'asset2').prefetch_ban_reasons()
+    )
     serializer_class = MarketKeySerializer
     permission_classes = (AllowAny, )
     pagination_class = MarketKeyPagination
+    cursor_pagination_class = MarketKeyCursorPagination
+
+    # Keyset pagination is opt-in to keep page number clients working.
+    pagination_mode_query_param = 'pagination'
+    cursor_pagination_mode = 'cursor'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get(self.pagination_mode_query_param) == self.cursor_pagination_mode:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+
+        return self._paginator
+
+
+class RowListModelMixin(ListModelMixin):
+    # Lists are serialized from values() rows, see MarketKeyRowSerializer.
+    serializer_class = MarketKeyRowSerializer
+
+    def filter_queryset(self, queryset):
+        queryset = super(RowListModelMixin, self).filter_queryset(queryset)
+        return queryset.prefetch_related(None).values(*self.get_serializer_class().row_fields)
 
 
 class RetrieveMarketKeyView(RetrieveModelMixin, BaseMarketKeyView):
@@ -42,11 +70,11 @@ class RetrieveMarketKeyView(RetrieveModelMixin, BaseMarketKeyView):
         return obj
 
     def get(self, request, *args, **kwargs):
-        return self.retrieve(request, *args, **kwargs)
+        return self.get_cached_response(self.retrieve, request, *args, **kwargs)
 
 
 # TODO: Move this view to filter backend?
-class SearchMarketKeyView(ListModelMixin, BaseMarketKeyView):
+class SearchMarketKeyView(RowListModelMixin, BaseMarketKeyView):
     SEARCH_PARAM_NAME = 'asset'
 
     def get_search_param(self) -> Optional[Asset]:
@@ -65,26 +93,36 @@ class SearchMarketKeyView(ListModelMixin, BaseMarketKeyView):
         return queryset.filter_for_asset(search_asset)
 
     def get(self, request, *args, **kwargs):
-        return self.list(request, *args, **kwargs)
+        return self.get_cached_response(self.list, request, *args, **kwargs)
 
 
-class ListMarketKeyView(ListModelMixin, BaseMarketKeyView):
+class ListMarketKeyView(SnapshotResponseMixin, RowListModelMixin, BaseMarketKeyView):
     filter_backends = [MultiGetFilterBackend]
     multiget_filter_fields = ['account_id', 'downvote_account_id']
 
+    def is_multiget_request(self) -> bool:
+        return any(field in self.request.query_params for field in self.multiget_filter_fields)
+
+    def is_snapshot_request(self, request) -> bool:
+        # Snapshot holds default listing only, page number pagination slices it as a list.
+        return (
+            super(ListMarketKeyView, self).is_snapshot_request(request)
+            and not self.is_multiget_request()
+            and isinstance(self.paginator, self.pagination_class)
+        )
+
     def get_queryset(self):
         queryset = super(ListMarketKeyView, self).get_queryset()
 
-        if all(field not in self.request.query_params for field in self.multiget_filter_fields):
-            queryset = queryset.exclude(
-                downvote_account_id__isnull=True,
-            ).exclude(
-                asset1__is_banned=True,
-            ).exclude(
-                asset2__is_banned=True,
-            )
+        if not self.is_multiget_request():
+            queryset = queryset.filter_listed()
 
         return queryset
 
     def get(self, request, *args, **kwargs):
-        return self.list(request, *args, **kwargs)
+        if self.is_snapshot_request(request):
+            response = self.get_snapshot_response(request)
+            if response is not None:
+                return response
+
+        return self.get_cached_response(self.list, request, *args, **kwargs)
@@ -0,0 +1,54 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Set
+
+from django.db.transaction import atomic
+from django.utils import timezone
+
+from aqua_marketkeys_tracker.marketkeys.models import Asset, AssetBan
+from aqua_marketkeys_tracker.utils.metrics import loader_rows
+
+
+class AssetBanReconciler:
+    def __init__(self, reasons: Iterable[str]):
+        # Only bans with these reasons are managed by reconciler.
+        self.reasons = list(reasons)
+
+    def reconcile(self, desired_reasons: Dict[Asset, Set[str]]) -> bool:
+        current_bans = defaultdict(list)
+        for ban in AssetBan.objects.filter(
+            asset__in=list(desired_reasons), reason__in=self.reasons, status=AssetBan.Status.BANNED,
+        ).only('id', 'asset', 'reason'):
+            current_bans[(ban.asset_id, ban.reason)].append(ban.id)
+
+        new_bans = []
+        fixed_ban_ids = []
+        banned_asset_ids = []
+        for asset, reasons in desired_reasons.items():
+            asset_new_bans = []
+            for reason in self.reasons:
+                ban_ids = current_bans.get((asset.id, reason))
+                if reason in reasons and not ban_ids:
+                    asset_new_bans.append(AssetBan(asset=asset, reason=reason, status=AssetBan.Status.BANNED))
+                elif reason not in reasons and ban_ids:
+                    fixed_ban_ids.extend(ban_ids)
+
+            # Flag is set even if asset looks banned already, unban task may have cleared it since asset was loaded.
+            if asset_new_bans:
+                asset.is_banned = True
+                banned_asset_ids.append(asset.id)
+
+            new_bans.extend(asset_new_bans)
+
+        if not new_bans and not fixed_ban_ids:
+            return False
+
+        with atomic():
+            AssetBan.objects.bulk_create(new_bans)
+            Asset.objects.filter(id__in=banned_asset_ids).update(is_banned=True)
+            AssetBan.objects.filter(id__in=fixed_ban_ids).update(
+                status=AssetBan.Status.FIXED, fixed_at=timezone.now(),
+            )
+
+        loader_rows.labels('asset_bans', 'banned').inc(len(new_bans))
+        loader_rows.labels('asset_bans', 'fixed').inc(len(fixed_ban_ids))
+        return True
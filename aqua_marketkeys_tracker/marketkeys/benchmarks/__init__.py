@@ -0,0 +1,29 @@
+from aqua_marketkeys_tracker.marketkeys.benchmarks.api import (
+    ListMarketKeyBenchmark,
+    MultiGetMarketKeyBenchmark,
+    SearchMarketKeyBenchmark,
+    SerializerBenchmark,
+)
+from aqua_marketkeys_tracker.marketkeys.benchmarks.loaders import (
+    AuthFlagsBenchmark,
+    DownvoteMarketKeyLoaderBenchmark,
+    MarketIsolationBenchmark,
+    MarketKeyLoaderBenchmark,
+    UnbanAssetsBenchmark,
+)
+
+
+BENCHMARKS = {
+    benchmark_class.name: benchmark_class
+    for benchmark_class in [
+        ListMarketKeyBenchmark,
+        MultiGetMarketKeyBenchmark,
+        SearchMarketKeyBenchmark,
+        SerializerBenchmark,
+        MarketIsolationBenchmark,
+        MarketKeyLoaderBenchmark,
+        DownvoteMarketKeyLoaderBenchmark,
+        AuthFlagsBenchmark,
+        UnbanAssetsBenchmark,
+    ]
+}
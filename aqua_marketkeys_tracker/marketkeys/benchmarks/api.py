@@ -0,0 +1,118 @@
+import time
+from abc import abstractmethod
+from math import ceil
+from typing import Iterator, Tuple
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIRequestFactory
+
+from aqua_marketkeys_tracker.marketkeys.api import ListMarketKeyView, SearchMarketKeyView
+from aqua_marketkeys_tracker.marketkeys.benchmarks.base import Benchmark
+from aqua_marketkeys_tracker.marketkeys.benchmarks.data import (
+    ban_assets,
+    create_assets,
+    create_market_keys,
+    get_native_asset,
+)
+from aqua_marketkeys_tracker.marketkeys.cache import bump_dataset_version
+from aqua_marketkeys_tracker.marketkeys.models import AssetBan, MarketKey
+from aqua_marketkeys_tracker.marketkeys.serializers import MarketKeyRowSerializer, MarketKeySerializer
+
+
+class MarketKeyDataBenchmark(Benchmark):
+    PAGE_SIZE = 200
+    BANNED_ASSETS_RATIO = 3
+
+    def setup(self):
+        # Cached responses of previous runs must not be served.
+        bump_dataset_version()
+
+        self.native_asset = get_native_asset()
+        assets = create_assets(self.size)
+        ban_assets(assets[::self.BANNED_ASSETS_RATIO], AssetBan.Reason.AUTH_REQUIRED)
+        self.market_keys = create_market_keys((self.native_asset, asset) for asset in assets)
+
+
+class MarketKeyApiBenchmark(MarketKeyDataBenchmark):
+    def setup(self):
+        super(MarketKeyApiBenchmark, self).setup()
+        self.request_factory = APIRequestFactory()
+
+    @abstractmethod
+    def get_requests(self) -> Iterator[Tuple[type, dict]]:
+        pass
+
+    def run(self):
+        page_queries = []
+        for view_class, params in self.get_requests():
+            request = self.request_factory.get('/api/market-keys/', params)
+            with CaptureQueriesContext(connection) as queries:
+                view_class.as_view()(request).render()
+
+            page_queries.append(len(queries))
+
+        return {
+            'pages': len(page_queries),
+            'min_queries_per_page': min(page_queries),
+            'max_queries_per_page': max(page_queries),
+        }
+
+
+class ListMarketKeyBenchmark(MarketKeyApiBenchmark):
+    name = 'api_list'
+
+    def get_requests(self):
+        pages = ceil(self.size / self.PAGE_SIZE)
+        for page in range(1, pages + 1):
+            yield ListMarketKeyView, {'limit': self.PAGE_SIZE, 'page': page}
+
+
+class MultiGetMarketKeyBenchmark(MarketKeyApiBenchmark):
+    name = 'api_multiget'
+
+    def get_requests(self):
+        for index in range(0, len(self.market_keys), self.PAGE_SIZE):
+            chunk = self.market_keys[index:index + self.PAGE_SIZE]
+            yield ListMarketKeyView, {'account_id': [market_key.account_id for market_key in chunk]}
+
+
+class SearchMarketKeyBenchmark(MarketKeyApiBenchmark):
+    name = 'api_search'
+
+    def get_requests(self):
+        pages = ceil(self.size / self.PAGE_SIZE)
+        for page in range(1, pages + 1):
+            yield SearchMarketKeyView, {'asset': 'native', 'limit': self.PAGE_SIZE, 'page': page}
+
+
+class SerializerBenchmark(MarketKeyDataBenchmark):
+    name = 'api_serializer'
+
+    def get_pages(self):
+        queryset = MarketKey.objects.order_by('id').select_related('asset1', 'asset2').prefetch_ban_reasons()
+        for index in range(0, self.size, self.PAGE_SIZE):
+            yield queryset[index:index + self.PAGE_SIZE]
+
+    def run(self):
+        model_serializer_time = row_serializer_time = 0
+        same_output = True
+        for page in self.get_pages():
+            started_at = time.perf_counter()
+            model_data = MarketKeySerializer(list(page), many=True).data
+            model_serializer_time += time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            row_data = MarketKeyRowSerializer(
+                page.prefetch_related(None).values(*MarketKeyRowSerializer.row_fields), many=True,
+            ).data
+            row_serializer_time += time.perf_counter() - started_at
+
+            same_output &= [dict(item) for item in model_data] == list(row_data)
+
+        return {
+            'model_serializer_time': round(model_serializer_time, 4),
+            'row_serializer_time': round(row_serializer_time, 4),
+            'same_output': same_output,
+        }
@@ -0,0 +1,72 @@
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Optional
+
+from django.db import connection, transaction
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from aqua_marketkeys_tracker.utils.stellar.horizon import request_stats
+
+
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'aqua_marketkeys_tracker.marketkeys.benchmarks.cache.BenchmarkCache',
+    },
+}
+
+
+@contextmanager
+def benchmark_environment():
+    # Benchmarks write rows, consume sequences and bump dataset version, so they never run against configured
+    # database and cache: data goes to a test database created for the run and cache is local to the process.
+    test_runner = DiscoverRunner(interactive=False, verbosity=0)
+    old_config = test_runner.setup_databases()
+    try:
+        with override_settings(CACHES=BENCHMARK_CACHES):
+            yield
+    finally:
+        test_runner.teardown_databases(old_config)
+
+
+class Benchmark(ABC):
+    name = NotImplemented
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def setup(self):
+        pass
+
+    @abstractmethod
+    def run(self) -> Optional[dict]:
+        pass
+
+    def execute(self) -> dict:
+        # Everything generated by the benchmark is rolled back after run.
+        with transaction.atomic():
+            self.setup()
+
+            horizon_requests = request_stats.total_requests
+
+            # Wall time includes tracing overhead, so it is comparable only with runs measured the same way.
+            tracemalloc.start()
+            with CaptureQueriesContext(connection) as queries:
+                started_at = time.perf_counter()
+                extra_results = self.run() or {}
+                wall_time = time.perf_counter() - started_at
+
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            transaction.set_rollback(True)
+
+        return {
+            'wall_time': round(wall_time, 4),
+            'db_queries': len(queries),
+            'horizon_requests': request_stats.total_requests - horizon_requests,
+            'peak_memory_kb': peak_memory // 1024,
+            **extra_results,
+        }
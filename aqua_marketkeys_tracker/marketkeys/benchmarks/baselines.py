@@ -0,0 +1,40 @@
+import json
+import os
+from typing import Dict, List
+
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+# Allowed growth against baseline. Counters are deterministic, memory varies slightly between runs.
+# Wall time depends on the machine, so it is reported but never treated as regression.
+REGRESSION_TOLERANCE = {
+    'db_queries': 1,
+    'horizon_requests': 1,
+    'peak_memory_kb': 1.25,
+}
+
+
+def load_baselines() -> Dict[str, dict]:
+    if not os.path.exists(BASELINES_PATH):
+        return {}
+
+    with open(BASELINES_PATH) as baselines_file:
+        return json.load(baselines_file)
+
+
+def save_baselines(baselines: Dict[str, dict]):
+    with open(BASELINES_PATH, 'w') as baselines_file:
+        json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+        baselines_file.write('\n')
+
+
+def get_regressions(results: dict, baseline: dict) -> List[str]:
+    regressions = []
+    for metric, tolerance in REGRESSION_TOLERANCE.items():
+        if metric not in baseline:
+            continue
+
+        if results[metric] > baseline[metric] * tolerance:
+            regressions.append(f'{metric} {results[metric]} > {baseline[metric]}')
+
+    return regressions
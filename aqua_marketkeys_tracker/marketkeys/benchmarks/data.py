@@ -0,0 +1,83 @@
+from typing import Iterable, List, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from stellar_sdk import Asset as StellarAsset
+from stellar_sdk import Keypair
+
+from aqua_marketkeys_tracker.marketkeys.models import Asset, AssetBan, MarketKey
+
+
+def generate_stellar_assets(count: int) -> List[StellarAsset]:
+    return [StellarAsset(f'BENCH{index}', Keypair.random().public_key) for index in range(count)]
+
+
+def create_assets(count: int) -> List[Asset]:
+    issuers = [Keypair.random().public_key for _ in range(count)]
+    Asset.objects.bulk_create([
+        Asset(code=f'BENCH{index}', issuer=issuer, asset_string=f'BENCH{index}:{issuer}')
+        for index, issuer in enumerate(issuers)
+    ])
+
+    return list(Asset.objects.filter(issuer__in=issuers).order_by('id'))
+
+
+def get_native_asset() -> Asset:
+    return Asset.objects.get_or_create(asset_string='native', defaults={'code': 'XLM', 'issuer': ''})[0]
+
+
+def ban_assets(assets: Iterable[Asset], reason: str):
+    assets = list(assets)
+    Asset.objects.filter(id__in=[asset.id for asset in assets]).update(is_banned=True)
+    AssetBan.objects.bulk_create([
+        AssetBan(asset=asset, reason=reason, status=AssetBan.Status.BANNED) for asset in assets
+    ])
+
+
+def create_market_keys(pairs: Iterable[Tuple[Asset, Asset]], is_active: bool = True,
+                       with_downvote: bool = True) -> List[MarketKey]:
+    now = timezone.now()
+    market_keys = []
+    for asset1, asset2 in pairs:
+        market_key = MarketKey(
+            account_id=Keypair.random().public_key,
+            downvote_account_id=Keypair.random().public_key if with_downvote else None,
+            asset1=asset1,
+            asset2=asset2,
+            locked_at=now,
+            is_active=is_active,
+        )
+        market_key.pair_key = market_key.get_market_pair_key()
+        market_keys.append(market_key)
+
+    MarketKey.objects.bulk_create(market_keys)
+
+    return list(MarketKey.objects.filter(account_id__in=[market_key.account_id for market_key in market_keys]))
+
+
+def get_account_info(marker_key: str, asset1: StellarAsset, asset2: StellarAsset) -> dict:
+    # Horizon representation of a locked market key account.
+    account_id = Keypair.random().public_key
+    balances = [
+        {'asset_type': 'credit_alphanum12', 'asset_code': asset.code, 'asset_issuer': asset.issuer, 'balance': '0'}
+        for asset in (asset1, asset2)
+        if not asset.is_native()
+    ]
+    balances.append({'asset_type': 'native', 'balance': '1.5000000'})
+
+    return {
+        'account_id': account_id,
+        'paging_token': account_id,
+        'last_modified_time': timezone.now().isoformat(),
+        'signers': [
+            {'key': marker_key, 'weight': settings.MARKET_KEY_SIGNER_WEIGHT},
+            {'key': Keypair.random().public_key, 'weight': settings.MARKET_KEY_SIGNER_WEIGHT},
+        ],
+        'thresholds': {
+            'low_threshold': settings.MARKET_KEY_THRESHOLD,
+            'med_threshold': settings.MARKET_KEY_THRESHOLD,
+            'high_threshold': settings.MARKET_KEY_THRESHOLD,
+        },
+        'balances': balances,
+    }
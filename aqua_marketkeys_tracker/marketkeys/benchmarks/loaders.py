@@ -0,0 +1,148 @@
+import random
+
+from django.conf import settings
+from django.utils import timezone
+
+from stellar_sdk import Asset as StellarAsset
+
+from aqua_marketkeys_tracker.marketkeys.benchmarks.base import Benchmark
+from aqua_marketkeys_tracker.marketkeys.benchmarks.data import (
+    ban_assets,
+    create_assets,
+    create_market_keys,
+    generate_stellar_assets,
+    get_account_info,
+    get_native_asset,
+)
+from aqua_marketkeys_tracker.marketkeys.benchmarks.servers import FakeAssetsTracker, FakeHorizon
+from aqua_marketkeys_tracker.marketkeys.loaders.auth_flags import AuthFlagsLoader
+from aqua_marketkeys_tracker.marketkeys.loaders.market_isolation import MarketIsolationLoader
+from aqua_marketkeys_tracker.marketkeys.loaders.market_keys import DownvoteMarketKeyLoader, MarketKeyLoader
+from aqua_marketkeys_tracker.marketkeys.models import Asset, AssetBan, MarketKey
+from aqua_marketkeys_tracker.marketkeys.parser import MarketKeyParser
+
+
+def get_tail_latency(median: float = 0.005, tail: float = 0.5, tail_ratio: float = 0.05) -> float:
+    return tail if random.random() < tail_ratio else median  # noqa: S311
+
+
+class MarketIsolationBenchmark(Benchmark):
+    name = 'market_isolation'
+    ISOLATED_ASSETS_RATIO = 4
+
+    def setup(self):
+        assets = create_assets(self.size)
+        self.horizon = FakeHorizon(
+            isolated_assets=[str(asset) for asset in assets[::self.ISOLATED_ASSETS_RATIO]],
+            latency=get_tail_latency,
+        )
+
+    def run(self):
+        with self.horizon:
+            loader = MarketIsolationLoader()
+            loader.HORIZON_URL = self.horizon.url
+            loader.run()
+
+        return {
+            'banned_assets': Asset.objects.filter(is_banned=True).count(),
+        }
+
+
+class MarketKeyLoaderBenchmark(Benchmark):
+    name = 'market_keys'
+    # Every few accounts duplicate an existing pair, so activation has something to resolve.
+    DUPLICATED_PAIRS_RATIO = 5
+
+    def setup(self):
+        self.marker_key = settings.UPVOTE_MARKET_KEY_MARKER
+        assets = generate_stellar_assets(self.size)
+        accounts = [get_account_info(self.marker_key, StellarAsset.native(), asset) for asset in assets]
+        accounts.extend(
+            get_account_info(self.marker_key, asset, StellarAsset.native())
+            for asset in assets[::self.DUPLICATED_PAIRS_RATIO]
+        )
+        self.horizon = FakeHorizon(accounts=accounts)
+
+    def run(self):
+        with self.horizon:
+            loader = MarketKeyLoader(self.marker_key, MarketKeyParser(self.marker_key, NotImplemented))
+            loader.HORIZON_URL = self.horizon.url
+            loader.load_market_keys()
+
+        return {
+            'market_keys': MarketKey.objects.count(),
+        }
+
+
+class DownvoteMarketKeyLoaderBenchmark(Benchmark):
+    name = 'downvote_market_keys'
+
+    def setup(self):
+        self.marker_key = settings.DOWNVOTE_MARKET_KEY_MARKER
+        native_asset = get_native_asset()
+        assets = create_assets(self.size)
+        create_market_keys(((native_asset, asset) for asset in assets), with_downvote=False)
+
+        self.horizon = FakeHorizon(accounts=[
+            get_account_info(self.marker_key, StellarAsset.native(), asset.get_stellar_asset()) for asset in assets
+        ])
+
+    def run(self):
+        with self.horizon:
+            loader = DownvoteMarketKeyLoader(self.marker_key, MarketKeyParser(self.marker_key, NotImplemented))
+            loader.HORIZON_URL = self.horizon.url
+            loader.load_market_keys()
+
+        return {
+            'linked_market_keys': MarketKey.objects.exclude(downvote_account_id=None).count(),
+        }
+
+
+class AuthFlagsBenchmark(Benchmark):
+    name = 'auth_flags'
+    FLAGGED_ASSETS_RATIO = 4
+    BANNED_ASSETS_RATIO = 3
+
+    def setup(self):
+        assets = create_assets(self.size)
+        # Part of currently banned assets get fixed and part of clean ones get banned.
+        ban_assets(assets[::self.BANNED_ASSETS_RATIO], AssetBan.Reason.AUTH_REQUIRED)
+        self.assets_tracker = FakeAssetsTracker({
+            str(asset): {
+                'auth_required': index % self.FLAGGED_ASSETS_RATIO == 0,
+                'auth_revocable': False,
+                'auth_clawback_enabled': False,
+            }
+            for index, asset in enumerate(assets)
+        })
+
+    def run(self):
+        with self.assets_tracker:
+            loader = AuthFlagsLoader()
+            loader.ASSETS_TRACKER_URL = self.assets_tracker.url
+            loader.run()
+
+        return {
+            'tracker_requests': self.assets_tracker.total_requests,
+            'banned_assets': Asset.objects.filter(is_banned=True).count(),
+        }
+
+
+class UnbanAssetsBenchmark(Benchmark):
+    name = 'unban_assets'
+    # Every few assets keep another active ban and must stay banned.
+    STILL_BANNED_RATIO = 5
+
+    def setup(self):
+        assets = create_assets(self.size)
+        ban_assets(assets, AssetBan.Reason.AUTH_REQUIRED)
+        ban_assets(assets[::self.STILL_BANNED_RATIO], AssetBan.Reason.ISOLATED_MARKET)
+        AssetBan.objects.filter(reason=AssetBan.Reason.AUTH_REQUIRED).update(
+            status=AssetBan.Status.FIXED,
+            fixed_at=timezone.now() - AssetBan.UNBAN_TERM - timezone.timedelta(days=1),
+        )
+
+    def run(self):
+        return {
+            'unbanned': AssetBan.objects.filter_for_unban().unban(),
+        }
@@ -0,0 +1,168 @@
+import json
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients drop connections of cancelled requests, that's not an error of the fake server.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super(FakeHTTPServer, self).handle_error(request, client_address)
+
+
+class FakeServer(ABC):
+    def __init__(self, latency: Optional[Callable[[], float]] = None):
+        self.latency = latency or (lambda: 0)
+        self.requests = Counter()
+
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    @abstractmethod
+    def handle(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, dict]:
+        pass
+
+    def handle_stream(self, path: str, query: Dict[str, List[str]]) -> Iterable[Tuple[str, dict]]:
+        return []
+
+    def get_request_handler_class(self):
+        fake_server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def send_stream(self, events: Iterable[Tuple[str, dict]]):
+                body = ''.join(f'id: {event_id}\ndata: {json.dumps(data)}\n\n' for event_id, data in events).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # noqa: N802
+                url = urlparse(self.path)
+                with fake_server._lock:
+                    fake_server.requests[url.path] += 1
+
+                time.sleep(fake_server.latency())
+                if self.headers.get('Accept') == 'text/event-stream':
+                    return self.send_stream(fake_server.handle_stream(url.path, parse_qs(url.query)))
+
+                status, data = fake_server.handle(url.path, parse_qs(url.query))
+
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return RequestHandler
+
+    def start(self):
+        self._server = FakeHTTPServer(('127.0.0.1', 0), self.get_request_handler_class())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class FakeHorizon(FakeServer):
+    def __init__(self, accounts: Iterable[dict] = (), isolated_assets: Iterable[str] = (), effects: Iterable[dict] = (),
+                 **kwargs):
+        super(FakeHorizon, self).__init__(**kwargs)
+        self.accounts = sorted(accounts, key=lambda account_info: account_info['paging_token'])
+        self.accounts_map = {account_info['account_id']: account_info for account_info in self.accounts}
+        self.effects = sorted(effects, key=lambda effect: effect['paging_token'])
+        self.isolated_assets = set(isolated_assets)
+
+    def get_page(self, records: List[dict], query: Dict[str, List[str]]) -> dict:
+        limit = int(query.get('limit', ['10'])[0])
+        cursor = query.get('cursor', [None])[0]
+        if cursor:
+            records = [record for record in records if record['paging_token'] > cursor]
+
+        return {'_links': {}, '_embedded': {'records': records[:limit]}}
+
+    def get_accounts(self, query: Dict[str, List[str]]) -> dict:
+        signer = query.get('signer', [None])[0]
+        accounts = [
+            account_info for account_info in self.accounts
+            if any(s['key'] == signer for s in account_info['signers'])
+        ]
+        return self.get_page(accounts, query)
+
+    def get_strict_send_paths(self, query: Dict[str, List[str]]) -> dict:
+        destination_asset = query.get('destination_assets', [''])[0]
+        if destination_asset in self.isolated_assets:
+            records = []
+        else:
+            records = [{'destination_amount': '1.0000000', 'path': []}]
+
+        return {'_links': {}, '_embedded': {'records': records}}
+
+    def handle(self, path, query):
+        if path == '/accounts':
+            return 200, self.get_accounts(query)
+        if path.startswith('/accounts/'):
+            account_info = self.accounts_map.get(path[len('/accounts/'):])
+            return (200, account_info) if account_info else (404, {'status': 404})
+        if path == '/paths/strict-send':
+            return 200, self.get_strict_send_paths(query)
+
+        return 404, {'status': 404}
+
+    def handle_stream(self, path, query):
+        if path != '/effects':
+            return []
+
+        # Stream sends stored effects after the cursor, "now" is treated as a start before all of them.
+        cursor = query.get('cursor', ['now'])[0]
+        return [
+            (effect['paging_token'], effect) for effect in self.effects
+            if cursor == 'now' or effect['paging_token'] > cursor
+        ]
+
+
+class FakeAssetsTracker(FakeServer):
+    def __init__(self, assets_flags: Dict[str, dict], **kwargs):
+        super(FakeAssetsTracker, self).__init__(**kwargs)
+        self.assets_flags = assets_flags
+
+    def handle(self, path, query):
+        if path != '/api/v1/assets/':
+            return 404, {'detail': 'Not found.'}
+
+        return 200, {'results': [
+            {'asset_string': asset_string, **self.assets_flags[asset_string]}
+            for asset_string in query.get('asset', [])
+            if asset_string in self.assets_flags
+        ]}
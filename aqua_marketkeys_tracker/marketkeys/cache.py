@@ -0,0 +1,97 @@
+import hashlib
+import time
+from typing import Callable
+
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.utils.http import parse_etags, quote_etag
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from aqua_marketkeys_tracker.utils.metrics import api_cache_requests
+
+
+DATASET_VERSION_CACHE_KEY = 'marketkeys:dataset_version'
+
+RESPONSE_CACHE_KEY_PREFIX = 'marketkeys:response'
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+
+def get_dataset_version() -> int:
+    version = cache.get(DATASET_VERSION_CACHE_KEY)
+    if version is None:
+        # Start from current time, so the counter keeps growing even if it was evicted.
+        cache.add(DATASET_VERSION_CACHE_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(DATASET_VERSION_CACHE_KEY)
+
+    return version
+
+
+def bump_dataset_version():
+    try:
+        cache.incr(DATASET_VERSION_CACHE_KEY)
+    except ValueError:
+        get_dataset_version()
+
+
+def get_request_fingerprint(request: HttpRequest) -> str:
+    query_params = sorted(
+        (key, sorted(request.GET.getlist(key))) for key in request.GET
+    )
+    fingerprint = f'{request.build_absolute_uri(request.path)}?{query_params}'
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    response_cache_timeout = RESPONSE_CACHE_TIMEOUT
+
+    def get_response_cache_key(self, dataset_version: int, fingerprint: str) -> str:
+        return f'{RESPONSE_CACHE_KEY_PREFIX}:{dataset_version}:{fingerprint}'
+
+    def get_response_etag(self, dataset_version: int, fingerprint: str) -> str:
+        return quote_etag(f'{dataset_version}-{fingerprint[:32]}')
+
+    def is_not_modified(self, request: HttpRequest, etag: str, exists: bool = False) -> bool:
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if not if_none_match:
+            return False
+
+        # "*" matches any current representation, so it counts only once the resource is known to exist.
+        etags = parse_etags(if_none_match)
+        return etag in etags or (exists and '*' in etags)
+
+    def get_not_modified_response(self, etag: str) -> Response:
+        api_cache_requests.labels('not_modified').inc()
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    def get_cached_response(self, handler: Callable[..., Response], request, *args, **kwargs) -> Response:
+        dataset_version = get_dataset_version()
+        fingerprint = get_request_fingerprint(request)
+
+        etag = self.get_response_etag(dataset_version, fingerprint)
+        if self.is_not_modified(request, etag):
+            return self.get_not_modified_response(etag)
+
+        cache_key = self.get_response_cache_key(dataset_version, fingerprint)
+
+        # Only successful responses are cached, so a cached one means the resource exists.
+        data = cache.get(cache_key)
+        if data is not None:
+            if self.is_not_modified(request, etag, exists=True):
+                return self.get_not_modified_response(etag)
+
+            api_cache_requests.labels('hit').inc()
+            return Response(data, headers={'ETag': etag})
+
+        api_cache_requests.labels('miss').inc()
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, response.data, self.response_cache_timeout)
+            if self.is_not_modified(request, etag, exists=True):
+                return self.get_not_modified_response(etag)
+
+            response['ETag'] = etag
+
+        return response
@@ -1,17 +1,42 @@
-from typing import Iterable, Iterator, List
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Set, Tuple
 
 from django.conf import settings
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from aqua_marketkeys_tracker.marketkeys.bans import AssetBanReconciler
+from aqua_marketkeys_tracker.marketkeys.cache import bump_dataset_version
 from aqua_marketkeys_tracker.marketkeys.models import Asset, AssetBan
-from aqua_marketkeys_tracker.utils.stellar.asset import get_asset_string
+from aqua_marketkeys_tracker.utils.metrics import external_request_duration
 
 
 class AuthFlagsLoader:
     CHUNK_SIZE = 50
+    # Chunk requests kept in flight while earlier chunks are processed.
+    CONCURRENT_REQUESTS = 4
+    REQUEST_TIMEOUT = 30
 
     ASSETS_TRACKER_URL = settings.ASSETS_TRACKER_URL.rstrip("/")
+    ASSETS_ENDPOINT = '/api/v1/assets/'
+    IGNORE_FLAGS_ASSETS = frozenset(settings.IGNORE_FLAGS_ASSET_LIST)
+
+    BAN_REASONS = [
+        AssetBan.Reason.AUTH_REQUIRED,
+        AssetBan.Reason.AUTH_REVOCABLE,
+        AssetBan.Reason.AUTH_CLAWBACK_ENABLED,
+    ]
+
+    def __init__(self):
+        self.ban_reconciler = AssetBanReconciler(self.BAN_REASONS)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.CONCURRENT_REQUESTS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def get_asset_chunks(self) -> Iterator[List[Asset]]:
         index = 0
@@ -26,44 +51,74 @@ class AuthFlagsLoader:
             index = assets[-1].id
 
     def get_assets_endpoint(self) -> str:
-        return f'{self.ASSETS_TRACKER_URL}/api/v1/assets/'
+        return f'{self.ASSETS_TRACKER_URL}{self.ASSETS_ENDPOINT}'
 
     def load_asset_data(self, assets: Iterable[Asset]) -> List[dict]:
         endpoint = self.get_assets_endpoint()
         params = []
         for asset in assets:
             params.append(
-                ('asset', get_asset_string(asset.get_stellar_asset())),
+                ('asset', asset.asset_string),
             )
 
-        response = requests.get(endpoint, params=params)
+        started_at = time.perf_counter()
+        try:
+            response = self.session.get(endpoint, params=params, timeout=self.REQUEST_TIMEOUT)
+        except requests.RequestException:
+            external_request_duration.labels('assets_tracker', self.ASSETS_ENDPOINT, 'error').observe(
+                time.perf_counter() - started_at,
+            )
+            raise
+
+        external_request_duration.labels('assets_tracker', self.ASSETS_ENDPOINT, response.status_code).observe(
+            time.perf_counter() - started_at,
+        )
         response.raise_for_status()
 
         return response.json()['results']
 
-    def process_asset(self, asset: Asset, asset_data: dict):
-        # Temporary hack. I hope.
-        if get_asset_string(asset.get_stellar_asset()) in settings.IGNORE_FLAGS_ASSET_LIST:
-            return
+    def load_chunks_data(self) -> Iterator[Tuple[List[Asset], List[dict]]]:
+        with ThreadPoolExecutor(max_workers=self.CONCURRENT_REQUESTS) as executor:
+            pending = deque()
+            for chunk in self.get_asset_chunks():
+                if not chunk:
+                    continue
+
+                pending.append((chunk, executor.submit(self.load_asset_data, chunk)))
+                if len(pending) >= self.CONCURRENT_REQUESTS:
+                    chunk, future = pending.popleft()
+                    yield chunk, future.result()
 
+            while pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+
+    def get_ban_reasons(self, asset_data: dict) -> Set[str]:
+        ban_reasons = set()
         if asset_data['auth_required']:
-            asset.set_ban(AssetBan.Reason.AUTH_REQUIRED)
-        else:
-            asset.reset_ban(AssetBan.Reason.AUTH_REQUIRED)
+            ban_reasons.add(AssetBan.Reason.AUTH_REQUIRED)
         if asset_data['auth_revocable']:
-            asset.set_ban(AssetBan.Reason.AUTH_REVOCABLE)
-        else:
-            asset.reset_ban(AssetBan.Reason.AUTH_REVOCABLE)
+            ban_reasons.add(AssetBan.Reason.AUTH_REVOCABLE)
         if asset_data['auth_clawback_enabled']:
-            asset.set_ban(AssetBan.Reason.AUTH_CLAWBACK_ENABLED)
-        else:
-            asset.reset_ban(AssetBan.Reason.AUTH_CLAWBACK_ENABLED)
+            ban_reasons.add(AssetBan.Reason.AUTH_CLAWBACK_ENABLED)
+
+        return ban_reasons
 
     def run(self):
-        for chunk in self.get_asset_chunks():
-            assets_map = {
-                get_asset_string(asset.get_stellar_asset()): asset for asset in chunk
-            }
-            for asset_data in self.load_asset_data(chunk):
+        changed = False
+        for chunk, chunk_data in self.load_chunks_data():
+            assets_map = {asset.asset_string: asset for asset in chunk}
+
+            desired_reasons = {}
+            for asset_data in chunk_data:
+                # Temporary hack. I hope.
+                if asset_data['asset_string'] in self.IGNORE_FLAGS_ASSETS:
+                    continue
+
                 asset = assets_map[asset_data['asset_string']]
-                self.process_asset(asset, asset_data)
+                desired_reasons[asset] = self.get_ban_reasons(asset_data)
+
+            changed |= self.ban_reconciler.reconcile(desired_reasons)
+
+        if changed:
+            bump_dataset_version()
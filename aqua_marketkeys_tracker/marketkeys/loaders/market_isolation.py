@@ -1,19 +1,30 @@
 import asyncio
+import logging
 from decimal import Decimal
-from typing import AsyncIterator, List
+from typing import AsyncIterator, Dict, List
 
 from django.conf import settings
+from django.db import models
+from django.utils import timezone
 
-from asgiref.sync import sync_to_async
-from stellar_sdk import AiohttpClient
+from asgiref.sync import async_to_sync, sync_to_async
 from stellar_sdk import Asset as StellarAsset
 from stellar_sdk import ServerAsync
+from stellar_sdk.exceptions import BaseRequestError
 
-from aqua_marketkeys_tracker.marketkeys.models import Asset, AssetBan
+from aqua_marketkeys_tracker.marketkeys.bans import AssetBanReconciler
+from aqua_marketkeys_tracker.marketkeys.cache import bump_dataset_version
+from aqua_marketkeys_tracker.marketkeys.models import Asset, AssetBan, MarketKey
+from aqua_marketkeys_tracker.utils.metrics import loader_rows
+from aqua_marketkeys_tracker.utils.stellar.horizon import get_horizon_server_async
+
+
+logger = logging.getLogger(__name__)
 
 
 class MarketIsolationLoader:
     CHUNK_SIZE = 50
+    WRITE_BATCH_SIZE = 50
 
     HORIZON_URL = settings.HORIZON_URL
     POOL_SIZE = 20
@@ -23,11 +34,24 @@ class MarketIsolationLoader:
 
     BAN_REASON = AssetBan.Reason.ISOLATED_MARKET
 
+    # Stable assets are re-checked with exponential backoff, flipped ones from the minimal interval.
+    MIN_CHECK_INTERVAL = timezone.timedelta(minutes=5)
+    ACTIVE_MAX_CHECK_INTERVAL = timezone.timedelta(hours=1)
+    MAX_CHECK_INTERVAL = timezone.timedelta(days=1)
+    # Runs start with a varying delay after their crontab tick, so checks get due a bit before the interval passes.
+    CHECK_SLACK = MIN_CHECK_INTERVAL / 2
+
+    def __init__(self):
+        self.ban_reconciler = AssetBanReconciler([self.BAN_REASON])
+        self.started_at = timezone.now()
+
     async def get_asset_chunks(self) -> AsyncIterator[List[Asset]]:
         index = 0
         while True:
             assets = await sync_to_async(
-                lambda: list(Asset.objects.get_chunk(index, self.CHUNK_SIZE)),
+                lambda: list(
+                    Asset.objects.filter_isolation_check_due(self.started_at).get_chunk(index, self.CHUNK_SIZE),
+                ),
             )()
 
             yield assets
@@ -37,18 +61,45 @@ class MarketIsolationLoader:
 
             index = assets[-1].id
 
-    def process_asset(self, asset: Asset, is_isolated: bool):
-        if is_isolated:
-            asset.set_ban(self.BAN_REASON)
-        else:
-            asset.reset_ban(self.BAN_REASON)
+    def get_check_interval(self, asset: Asset, is_isolated: bool, is_active: bool) -> timezone.timedelta:
+        if asset.is_isolated != is_isolated or not asset.isolation_check_interval:
+            return self.MIN_CHECK_INTERVAL
+
+        max_interval = self.ACTIVE_MAX_CHECK_INTERVAL if is_active else self.MAX_CHECK_INTERVAL
+        return min(asset.isolation_check_interval * 2, max_interval)
+
+    def schedule_next_checks(self, results: Dict[Asset, bool]):
+        active_asset_ids = set()
+        for asset1_id, asset2_id in MarketKey.objects.filter_active().filter(
+            models.Q(asset1__in=list(results)) | models.Q(asset2__in=list(results)),
+        ).values_list('asset1_id', 'asset2_id'):
+            active_asset_ids.update((asset1_id, asset2_id))
+
+        for asset, is_isolated in results.items():
+            interval = self.get_check_interval(asset, is_isolated, asset.id in active_asset_ids)
+            asset.is_isolated = is_isolated
+            asset.isolation_checked_at = timezone.now()
+            asset.isolation_check_interval = interval
+            asset.isolation_next_check_at = self.started_at + interval - self.CHECK_SLACK
+
+        Asset.objects.bulk_update(results, [
+            'is_isolated', 'isolation_checked_at', 'isolation_check_interval', 'isolation_next_check_at',
+        ])
+        loader_rows.labels('market_isolation', 'checked').inc(len(results))
+
+    def process_assets(self, results: Dict[Asset, bool]) -> bool:
+        changed = self.ban_reconciler.reconcile({
+            asset: {self.BAN_REASON} if is_isolated else set()
+            for asset, is_isolated in results.items()
+        })
+        self.schedule_next_checks(results)
+
+        return changed
 
     def get_horizon_server(self) -> ServerAsync:
-        return ServerAsync(self.HORIZON_URL, client=AiohttpClient(
-            pool_size=self.POOL_SIZE,
-        ))
+        return get_horizon_server_async(self.HORIZON_URL, pool_size=self.POOL_SIZE)
 
-    async def check_asset(self, asset: Asset, server: ServerAsync):
+    async def check_asset(self, asset: Asset, server: ServerAsync) -> bool:
         response = await server.strict_send_paths(
             self.PATH_TEST_ASSET,
             str(self.PATH_TEST_AMOUNT),
@@ -56,14 +107,82 @@ class MarketIsolationLoader:
         ).call()
         records = response['_embedded']['records']
 
-        await sync_to_async(self.process_asset)(asset, len(records) == 0)
+        return len(records) == 0
 
-    async def async_run(self):
-        async with self.get_horizon_server() as server:
+    async def check_asset_to_queue(self, asset: Asset, server: ServerAsync, results_queue: asyncio.Queue):
+        try:
+            is_isolated = await self.check_asset(asset, server)
+        except BaseRequestError:
+            logger.warning('Market isolation check failed for %s.', asset, exc_info=True)
+            return
+
+        await results_queue.put((asset, is_isolated))
+
+    async def produce_results(self, server: ServerAsync, results_queue: asyncio.Queue):
+        # Keep POOL_SIZE checks in flight, independently of chunk boundaries.
+        semaphore = asyncio.Semaphore(self.POOL_SIZE)
+        tasks = set()
+
+        async def check(asset):
+            try:
+                await self.check_asset_to_queue(asset, server, results_queue)
+            finally:
+                semaphore.release()
+
+        try:
             async for chunk in self.get_asset_chunks():
-                await asyncio.gather(*(
-                    self.check_asset(asset, server) for asset in chunk
-                ))
+                for asset in chunk:
+                    await semaphore.acquire()
+                    task = asyncio.create_task(check(asset))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+            await asyncio.gather(*tasks)
+        finally:
+            # When producer is cancelled or a check fails, checks in flight are stopped before session is closed.
+            pending_tasks = list(tasks)
+            for task in pending_tasks:
+                task.cancel()
+            await asyncio.gather(*pending_tasks, return_exceptions=True)
+
+            await results_queue.put(None)
+
+    async def write_results(self, results_queue: asyncio.Queue) -> bool:
+        changed = False
+        batch = {}
+        while True:
+            result = await results_queue.get()
+            if result is not None:
+                asset, is_isolated = result
+                batch[asset] = is_isolated
+
+            if batch and (result is None or len(batch) >= self.WRITE_BATCH_SIZE):
+                changed |= await sync_to_async(self.process_assets)(batch)
+                batch = {}
+
+            if result is None:
+                return changed
+
+    async def async_run(self) -> bool:
+        results_queue = asyncio.Queue()
+        async with self.get_horizon_server() as server:
+            producer = asyncio.ensure_future(self.produce_results(server, results_queue))
+            writer = asyncio.ensure_future(self.write_results(results_queue))
+
+            # First failure cancels the other side, session is closed only after both are finished.
+            done, pending = await asyncio.wait([producer, writer], return_when=asyncio.FIRST_EXCEPTION)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for task in done:
+            task.result()
+
+        return writer.result()
 
     def run(self):
-        asyncio.run(self.async_run())
+        self.started_at = timezone.now()
+
+        # Database calls run in the calling thread and use its connection.
+        if async_to_sync(self.async_run)():
+            bump_dataset_version()
@@ -4,12 +4,16 @@ from typing import List, Optional
 
 from django.conf import settings
 
-from stellar_sdk import Server
-
+from aqua_marketkeys_tracker.marketkeys.cache import bump_dataset_version
 from aqua_marketkeys_tracker.marketkeys.exceptions import MarketKeyParsingError
 from aqua_marketkeys_tracker.marketkeys.models import MarketKey
+from aqua_marketkeys_tracker.marketkeys.pair import get_pair_key
 from aqua_marketkeys_tracker.marketkeys.parser import MarketKeyParser
-from aqua_marketkeys_tracker.utils.stellar.requests import load_all_records
+from aqua_marketkeys_tracker.taskapp.locks import hold_lock
+from aqua_marketkeys_tracker.utils.metrics import loader_rows
+from aqua_marketkeys_tracker.utils.stellar.asset import get_asset_string
+from aqua_marketkeys_tracker.utils.stellar.horizon import get_horizon_server
+from aqua_marketkeys_tracker.utils.stellar.requests import load_all_pages
 
 
 logger = logging.getLogger(__name__)
@@ -17,6 +21,8 @@ logger = logging.getLogger(__name__)
 
 class MarketKeyLoader:
     MARKET_KEYS_PAGE_LIMIT = 200
+    # Polling tasks and stream write the same keys, writes are serialized so activation sees stored pairs.
+    WRITE_LOCK_NAME = 'marketkeys:market_keys_write'
     HORIZON_URL = settings.HORIZON_URL
 
     def __init__(self, marker_key: str, parser: MarketKeyParser):
@@ -24,37 +30,128 @@ class MarketKeyLoader:
         self.marker_key = marker_key
 
     def parse_market_key(self, account_info: dict) -> Optional[MarketKey]:
-        account_id = account_info['account_id']
-        if MarketKey.objects.filter(account_id=account_id).exists():
-            return
-
         try:
             return self.parser.parse_account_info(account_info)
         except MarketKeyParsingError:
             logger.warning('Account info skipped.', exc_info=sys.exc_info())
 
+    def parse_market_keys_page(self, records: List[dict]) -> List[MarketKey]:
+        known_account_ids = set(MarketKey.objects.filter(
+            account_id__in=[account_info['account_id'] for account_info in records],
+        ).values_list('account_id', flat=True))
+
+        new_records = [
+            account_info for account_info in records if account_info['account_id'] not in known_account_ids
+        ]
+        self.parser.load_accounts_assets(new_records)
+
+        market_keys = []
+        for account_info in new_records:
+            market_key = self.parse_market_key(account_info)
+            if market_key:
+                market_keys.append(market_key)
+
+        return market_keys
+
     def activate_market_keys(self, market_keys: List[MarketKey]):
-        exists_market_pairs = set()
+        if not market_keys:
+            return
+
+        # Load pairs of all stored keys built from the same assets at once instead of a query per key.
+        assets = {asset for market_key in market_keys for asset in (market_key.asset1, market_key.asset2)}
+        exists_market_pairs = MarketKey.objects.filter_within_assets(assets).get_market_pair_keys()
+
         for market_key in sorted(market_keys, key=lambda mk: mk.locked_at):
-            market_pair = market_key.get_market_pair()
-            if market_pair in exists_market_pairs:
+            market_pair_key = market_key.get_market_pair_key()
+            if market_pair_key in exists_market_pairs:
                 continue
 
-            if not MarketKey.objects.filter_for_market_pair(market_pair).exists():
-                market_key.is_active = True
+            market_key.is_active = True
+            exists_market_pairs.add(market_pair_key)
+
+    def get_request_builder(self):
+        horizon_server = get_horizon_server(self.HORIZON_URL)
 
-            exists_market_pairs.add(market_pair)
+        # Accounts are ordered by account id, not by creation, so every run walks all of them.
+        return horizon_server.accounts().for_signer(self.marker_key).order(desc=False)
 
     def load_market_keys(self):
-        horizon_server = Server(self.HORIZON_URL)
+        new_market_key_list = []
+        for records in load_all_pages(self.get_request_builder(), page_size=self.MARKET_KEYS_PAGE_LIMIT):
+            new_market_key_list.extend(self.parse_market_keys_page(records))
 
-        request_builder = horizon_server.accounts().for_signer(self.marker_key).order(desc=False)
+        self.save_market_keys(new_market_key_list)
 
-        new_market_key_list = []
-        for account_info in load_all_records(request_builder, page_size=self.MARKET_KEYS_PAGE_LIMIT):
-            market_key = self.parse_market_key(account_info)
-            if market_key:
-                new_market_key_list.append(market_key)
+    def save_market_keys(self, market_keys: List[MarketKey]) -> bool:
+        if not market_keys:
+            return False
+
+        with hold_lock(self.WRITE_LOCK_NAME):
+            self.activate_market_keys(market_keys)
+            # Accounts parsed before the lock may have been stored by another writer meanwhile.
+            MarketKey.objects.bulk_create(market_keys, ignore_conflicts=True)
+
+        loader_rows.labels('market_keys', 'created').inc(len(market_keys))
+        bump_dataset_version()
+        return True
+
+    def process_accounts(self, records: List[dict]) -> bool:
+        return self.save_market_keys(self.parse_market_keys_page(records))
 
-        self.activate_market_keys(new_market_key_list)
-        MarketKey.objects.bulk_create(new_market_key_list)
+
+class DownvoteMarketKeyLoader(MarketKeyLoader):
+    def parse_market_pair_key(self, account_info: dict) -> Optional[str]:
+        try:
+            self.parser.verify_signers(account_info)
+            asset1, asset2 = self.parser.parse_market_assets(account_info)
+        except MarketKeyParsingError:
+            logger.warning('Account info skipped.', exc_info=sys.exc_info())
+            return
+
+        return get_pair_key(get_asset_string(asset1), get_asset_string(asset2))
+
+    def link_market_keys(self, records: List[dict]) -> List[MarketKey]:
+        known_account_ids = set(MarketKey.objects.filter(
+            downvote_account_id__in=[account_info['account_id'] for account_info in records],
+        ).values_list('downvote_account_id', flat=True))
+
+        market_pair_keys = {}
+        for account_info in records:
+            account_id = account_info['account_id']
+            if account_id in known_account_ids:
+                continue
+
+            market_pair_key = self.parse_market_pair_key(account_info)
+            if market_pair_key:
+                market_pair_keys[account_id] = market_pair_key
+
+        market_keys_map = MarketKey.objects.filter_active().filter(
+            pair_key__in=market_pair_keys.values(),
+        ).get_market_pair_map()
+
+        linked_market_keys = []
+        for account_id, market_pair_key in market_pair_keys.items():
+            market_key = market_keys_map.get(market_pair_key)
+            if not market_key or market_key.downvote_account_id:
+                continue
+
+            market_key.downvote_account_id = account_id
+            linked_market_keys.append(market_key)
+
+        return linked_market_keys
+
+    def process_accounts(self, records: List[dict]) -> bool:
+        with hold_lock(self.WRITE_LOCK_NAME):
+            linked_market_keys = self.link_market_keys(records)
+            if not linked_market_keys:
+                return False
+
+            MarketKey.objects.bulk_update(linked_market_keys, ['downvote_account_id'])
+
+        loader_rows.labels('downvote_market_keys', 'updated').inc(len(linked_market_keys))
+        bump_dataset_version()
+        return True
+
+    def load_market_keys(self):
+        for records in load_all_pages(self.get_request_builder(), page_size=self.MARKET_KEYS_PAGE_LIMIT):
+            self.process_accounts(records)
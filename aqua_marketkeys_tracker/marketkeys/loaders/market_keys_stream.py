@@ -0,0 +1,101 @@
+import logging
+import sys
+import time
+from typing import Iterable, Optional
+
+from django.conf import settings
+
+from stellar_sdk import Server
+from stellar_sdk.exceptions import BaseRequestError, NotFoundError, StreamClientError
+
+from aqua_marketkeys_tracker.marketkeys.loaders.market_keys import MarketKeyLoader
+from aqua_marketkeys_tracker.marketkeys.models import SyncCursor
+from aqua_marketkeys_tracker.marketkeys.snapshot import MarketKeySnapshot
+from aqua_marketkeys_tracker.utils.stellar.horizon import get_horizon_server
+
+
+logger = logging.getLogger(__name__)
+
+
+class MarketKeyStreamer:
+    HORIZON_URL = settings.HORIZON_URL
+    SYNC_CURSOR_NAME = 'market_keys:stream'
+    CURSOR_SAVE_INTERVAL = 10
+    # Snapshot holds the whole listing, so it is rebuilt at most once per interval however many keys arrive.
+    SNAPSHOT_REFRESH_INTERVAL = 10
+    RECONNECT_DELAY = 5
+
+    def __init__(self, loaders: Iterable[MarketKeyLoader]):
+        self.loaders = {loader.marker_key: loader for loader in loaders}
+
+        self.cursor = None
+        self.cursor_saved_at = 0
+
+        self.snapshot_outdated = False
+        self.snapshot_refreshed_at = 0
+
+    def get_start_cursor(self) -> str:
+        # Accounts created before the first start are found by the polling tasks.
+        return self.cursor or SyncCursor.objects.get_cursor(self.SYNC_CURSOR_NAME) or 'now'
+
+    def save_cursor(self, force: bool = False):
+        if not self.cursor:
+            return
+
+        if not force and time.monotonic() - self.cursor_saved_at < self.CURSOR_SAVE_INTERVAL:
+            return
+
+        SyncCursor.objects.set_cursor(self.SYNC_CURSOR_NAME, self.cursor)
+        self.cursor_saved_at = time.monotonic()
+
+    def refresh_snapshot(self, force: bool = False):
+        if not self.snapshot_outdated:
+            return
+
+        if not force and time.monotonic() - self.snapshot_refreshed_at < self.SNAPSHOT_REFRESH_INTERVAL:
+            return
+
+        MarketKeySnapshot().refresh()
+        self.snapshot_outdated = False
+        self.snapshot_refreshed_at = time.monotonic()
+
+    def handle_effect(self, server: Server, effect: dict):
+        if effect['type'] != 'signer_created':
+            return
+
+        loader = self.loaders.get(effect['public_key'])
+        if not loader:
+            return
+
+        try:
+            account_info = server.accounts().account_id(effect['account']).call()
+        except NotFoundError:
+            logger.warning('Market key account %s not found.', effect['account'])
+            return
+
+        if loader.process_accounts([account_info]):
+            self.snapshot_outdated = True
+
+    def run(self, max_events: Optional[int] = None):
+        server = get_horizon_server(self.HORIZON_URL)
+
+        events_count = 0
+        while True:
+            try:
+                for effect in server.effects().cursor(self.get_start_cursor()).stream():
+                    self.handle_effect(server, effect)
+
+                    # Cursor is stored after the effect is handled, so restart replays it rather than skips.
+                    self.cursor = effect['paging_token']
+                    self.save_cursor()
+                    self.refresh_snapshot()
+
+                    events_count += 1
+                    if max_events and events_count >= max_events:
+                        return
+            except (StreamClientError, BaseRequestError):
+                logger.warning('Horizon effects stream interrupted.', exc_info=sys.exc_info())
+                time.sleep(self.RECONNECT_DELAY)
+            finally:
+                self.save_cursor(force=True)
+                self.refresh_snapshot(force=True)
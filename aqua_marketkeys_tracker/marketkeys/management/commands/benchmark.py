@@ -0,0 +1,64 @@
+import os
+
+from django.core.management import BaseCommand, CommandError
+
+from aqua_marketkeys_tracker.marketkeys.benchmarks import BENCHMARKS
+from aqua_marketkeys_tracker.marketkeys.benchmarks.base import benchmark_environment
+from aqua_marketkeys_tracker.marketkeys.benchmarks.baselines import get_regressions, load_baselines, save_baselines
+
+
+class Command(BaseCommand):
+    help = 'Run benchmarks on a test database and local memory cache, configured ones are never touched.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('benchmarks', nargs='*', metavar='benchmark', help=', '.join(sorted(BENCHMARKS)))
+        parser.add_argument('--size', type=int, default=1000)
+        parser.add_argument('--save-baselines', action='store_true',
+                            help='Store results as baselines instead of comparing with them.')
+
+    def format_results(self, results: dict, baseline: dict) -> str:
+        return ', '.join(
+            f'{key}={value}' + (f' ({baseline[key]})' if key in baseline and baseline[key] != value else '')
+            for key, value in results.items()
+        )
+
+    def handle(self, *args, **options):
+        names = options['benchmarks'] or sorted(BENCHMARKS)
+        unknown_names = set(names) - set(BENCHMARKS)
+        if unknown_names:
+            raise CommandError(f'Unknown benchmarks: {", ".join(sorted(unknown_names))}.')
+
+        # Loaders count rows in prometheus metrics, in multiprocess mode they would be written to live metric files.
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            raise CommandError('Unset PROMETHEUS_MULTIPROC_DIR to run benchmarks.')
+
+        size = options['size']
+        baselines = load_baselines()
+
+        regressions = {}
+        with benchmark_environment():
+            for name in names:
+                results = BENCHMARKS[name](size).execute()
+
+                baseline = baselines.get(name, {})
+                if baseline.get('size') != size:
+                    baseline = {}
+
+                self.stdout.write(f'{name}: ' + self.format_results(results, baseline))
+
+                if options['save_baselines']:
+                    baselines[name] = {'size': size, **results}
+                    continue
+
+                benchmark_regressions = get_regressions(results, baseline)
+                if benchmark_regressions:
+                    regressions[name] = benchmark_regressions
+
+        if options['save_baselines']:
+            save_baselines(baselines)
+            self.stdout.write(f'Baselines saved for {", ".join(names)}.')
+
+        if regressions:
+            raise CommandError('Regressions against baselines: ' + '; '.join(
+                f'{name}: {", ".join(items)}' for name, items in regressions.items()
+            ))
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from aqua_marketkeys_tracker.marketkeys.loaders.market_keys import DownvoteMarketKeyLoader, MarketKeyLoader
+from aqua_marketkeys_tracker.marketkeys.loaders.market_keys_stream import MarketKeyStreamer
+from aqua_marketkeys_tracker.marketkeys.parser import MarketKeyParser
+
+
+class Command(BaseCommand):
+    help = 'Follow Horizon effects stream and load new upvote and downvote market keys as they appear.'
+
+    def handle(self, *args, **options):
+        upvote_marker = settings.UPVOTE_MARKET_KEY_MARKER
+        downvote_marker = settings.DOWNVOTE_MARKET_KEY_MARKER
+
+        MarketKeyStreamer([
+            MarketKeyLoader(upvote_marker, MarketKeyParser(upvote_marker, NotImplemented)),
+            DownvoteMarketKeyLoader(downvote_marker, MarketKeyParser(downvote_marker, NotImplemented)),
+        ]).run()
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketkeys', '0008_auto_20220218_1141'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128, unique=True)),
+                ('cursor', models.CharField(max_length=128)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
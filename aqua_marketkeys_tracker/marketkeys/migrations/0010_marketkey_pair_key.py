@@ -0,0 +1,62 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+def get_asset_string(asset):
+    if not asset.issuer:
+        return 'native'
+
+    return f'{asset.code}:{asset.issuer}'
+
+
+def fill_pair_key(apps, schema_editor):
+    MarketKey = apps.get_model('marketkeys', 'MarketKey')
+
+    market_keys = list(MarketKey.objects.select_related('asset1', 'asset2'))
+    for market_key in market_keys:
+        market_key.pair_key = '-'.join(sorted([
+            get_asset_string(market_key.asset1),
+            get_asset_string(market_key.asset2),
+        ]))
+
+    MarketKey.objects.bulk_update(market_keys, ['pair_key'], batch_size=1000)
+
+
+def deactivate_duplicated_pairs(apps, schema_editor):
+    # Unique active pair constraint can't be added while a pair has several active keys.
+    # As on activation in the loader, the key locked first stays active.
+    MarketKey = apps.get_model('marketkeys', 'MarketKey')
+
+    active_pair_keys = set()
+    duplicated_ids = []
+    active_market_keys = MarketKey.objects.filter(is_active=True).order_by('locked_at', 'id')
+    for market_key_id, pair_key in active_market_keys.values_list('id', 'pair_key'):
+        if pair_key in active_pair_keys:
+            duplicated_ids.append(market_key_id)
+        else:
+            active_pair_keys.add(pair_key)
+
+    MarketKey.objects.filter(id__in=duplicated_ids).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketkeys', '0009_synccursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='marketkey',
+            name='pair_key',
+            field=models.CharField(db_index=True, default='', max_length=140),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_pair_key, migrations.RunPython.noop),
+        migrations.RunPython(deactivate_duplicated_pairs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='marketkey',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('pair_key',), name='marketkey_unique_active_pair_key'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketkeys', '0010_marketkey_pair_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='is_isolated',
+            field=models.BooleanField(null=True),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='isolation_check_interval',
+            field=models.DurationField(null=True),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='isolation_checked_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='isolation_next_check_at',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+    ]
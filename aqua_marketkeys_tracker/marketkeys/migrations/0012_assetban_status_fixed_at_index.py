@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketkeys', '0011_asset_isolation_check_schedule'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assetban',
+            index=models.Index(fields=['status', 'fixed_at'], name='marketkeys__status_9cde48_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:10
+
+from django.db import migrations, models
+from django.db.models.functions import Concat
+
+
+def fill_asset_string(apps, schema_editor):
+    Asset = apps.get_model('marketkeys', 'Asset')
+
+    Asset.objects.update(asset_string=models.Case(
+        models.When(issuer='', then=models.Value('native')),
+        default=Concat('code', models.Value(':'), 'issuer'),
+        output_field=models.CharField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketkeys', '0012_assetban_status_fixed_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='asset_string',
+            field=models.CharField(max_length=69, null=True),
+        ),
+        migrations.RunPython(fill_asset_string, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='asset',
+            name='asset_string',
+            field=models.CharField(max_length=69, unique=True),
+        ),
+    ]
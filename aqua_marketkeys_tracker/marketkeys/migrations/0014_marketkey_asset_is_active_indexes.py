@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketkeys', '0013_asset_asset_string'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='marketkey',
+            index=models.Index(fields=['asset1', 'is_active'], name='marketkeys__asset1__5ae029_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketkey',
+            index=models.Index(fields=['asset2', 'is_active'], name='marketkeys__asset2__44d67c_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketkeys', '0014_marketkey_asset_is_active_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assetban',
+            name='reason',
+            field=models.CharField(choices=[('auth_req', 'Auth Required'), ('auth_rev', 'Auth Revocable'), ('auth_cla', 'Auth Clawback Enabled'), ('isolated', 'Isolated Market')], max_length=8),
+        ),
+    ]
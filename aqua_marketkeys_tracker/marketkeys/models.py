@@ -1,3 +1,5 @@
+from typing import Dict, Iterable, Optional, Set
+
 from django.db import models
 from django.db.transaction import atomic
 from django.utils import timezone
@@ -5,24 +7,37 @@ from django.utils.functional import cached_property
 
 from stellar_sdk import Asset as StellarAsset
 
-from aqua_marketkeys_tracker.marketkeys.pair import MarketPair
-from aqua_marketkeys_tracker.utils.stellar.asset import get_asset_string
+from aqua_marketkeys_tracker.marketkeys.pair import MarketPair, get_pair_key
+from aqua_marketkeys_tracker.utils.stellar.asset import get_asset_string, get_asset_string_by_parts
 
 
 class AssetQuerySet(models.QuerySet):
     def get_chunk(self, cursor, chunk_size):
         return self.order_by('id').filter(id__gt=cursor)[:chunk_size]
 
+    def filter_isolation_check_due(self, now):
+        return self.filter(
+            models.Q(isolation_next_check_at__isnull=True) | models.Q(isolation_next_check_at__lte=now),
+        )
+
 
 class Asset(models.Model):
     code = models.CharField(max_length=12)
     issuer = models.CharField(max_length=56)
+    # Canonical "native" or "CODE:ISSUER" string, filled on save from code and issuer.
+    asset_string = models.CharField(max_length=69, unique=True)
 
     is_banned = models.BooleanField(default=False)
 
     voting_boost = models.DecimalField(max_digits=5, decimal_places=4, default=0)
     voting_boost_cap = models.DecimalField(max_digits=5, decimal_places=4, default=0)
 
+    # Market isolation check schedule, see MarketIsolationLoader.
+    is_isolated = models.BooleanField(null=True)
+    isolation_checked_at = models.DateTimeField(null=True)
+    isolation_check_interval = models.DurationField(null=True)
+    isolation_next_check_at = models.DateTimeField(null=True, db_index=True)
+
     objects = AssetQuerySet.as_manager()
 
     class Meta:
@@ -32,7 +47,11 @@ class Asset(models.Model):
         ]
 
     def __str__(self):
-        return get_asset_string(self.get_stellar_asset())
+        return self.asset_string or get_asset_string_by_parts(self.code, self.issuer)
+
+    def save(self, *args, **kwargs):
+        self.asset_string = get_asset_string_by_parts(self.code, self.issuer)
+        super(Asset, self).save(*args, **kwargs)
 
     def get_stellar_asset(self) -> StellarAsset:
         return StellarAsset(self.code, self.issuer or None)
@@ -65,39 +84,61 @@ class MarketKeyQuerySet(models.QuerySet):
     def filter_active(self):
         return self.filter(is_active=True)
 
-    def filter_for_market_pair(self, market_pair: MarketPair):
-        return self.filter(
-            models.Q(
-                asset1__code=market_pair.asset1.code,
-                asset1__issuer=market_pair.asset1.issuer or '',
-                asset2__code=market_pair.asset2.code,
-                asset2__issuer=market_pair.asset2.issuer or '',
-            ) | models.Q(
-                asset1__code=market_pair.asset2.code,
-                asset1__issuer=market_pair.asset2.issuer or '',
-                asset2__code=market_pair.asset1.code,
-                asset2__issuer=market_pair.asset1.issuer or '',
-            ),
+    def filter_listed(self):
+        # Default listing: keys with both votes accounts and no banned assets.
+        return self.exclude(
+            downvote_account_id__isnull=True,
+        ).exclude(
+            asset1__is_banned=True,
+        ).exclude(
+            asset2__is_banned=True,
         )
 
+    def filter_for_market_pair(self, market_pair: MarketPair):
+        return self.filter(pair_key=market_pair.key)
+
     def filter_for_asset(self, asset: StellarAsset):
-        return self.filter(
-            models.Q(
-                asset1__code=asset.code,
-                asset1__issuer=asset.issuer or '',
-            ) | models.Q(
-                asset2__code=asset.code,
-                asset2__issuer=asset.issuer or '',
-            ),
+        # Resolve asset first, so the planner gets a constant id and can combine (asset1, is_active)
+        # and (asset2, is_active) indexes instead of scanning market keys joined with assets.
+        asset_id = Asset.objects.filter(asset_string=get_asset_string(asset)).values_list('id', flat=True).first()
+        if asset_id is None:
+            return self.none()
+
+        return self.filter(models.Q(asset1_id=asset_id) | models.Q(asset2_id=asset_id))
+
+    def prefetch_ban_reasons(self):
+        bans_queryset = AssetBan.objects.filter_active().only('asset', 'reason')
+
+        return self.prefetch_related(
+            models.Prefetch('asset1__bans', queryset=bans_queryset, to_attr='active_bans'),
+            models.Prefetch('asset2__bans', queryset=bans_queryset, to_attr='active_bans'),
         )
 
+    def filter_within_assets(self, assets: Iterable['Asset']):
+        assets = list(assets)
+        return self.filter(asset1__in=assets, asset2__in=assets)
+
+    def get_market_pair_map(self) -> Dict[str, 'MarketKey']:
+        market_pair_map = {}
+        for market_key in self.order_by('id'):
+            market_pair_map.setdefault(market_key.pair_key, market_key)
+
+        return market_pair_map
+
+    def get_market_pair_keys(self) -> Set[str]:
+        return set(self.values_list('pair_key', flat=True))
+
 
 class MarketKey(models.Model):
+    PAIR_KEY_FIELDS = {'asset1', 'asset1_id', 'asset2', 'asset2_id', 'pair_key'}
+
     account_id = models.CharField(max_length=56, unique=True)
     downvote_account_id = models.CharField(max_length=56, unique=True, null=True)
 
     asset1 = models.ForeignKey(Asset, related_name='+', on_delete=models.DO_NOTHING)
     asset2 = models.ForeignKey(Asset, related_name='+', on_delete=models.DO_NOTHING)
+    # Sorted asset strings of the pair, see MarketPair.key.
+    pair_key = models.CharField(max_length=140, db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     locked_at = models.DateTimeField()
@@ -106,24 +147,63 @@ class MarketKey(models.Model):
 
     objects = MarketKeyQuerySet.as_manager()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['pair_key'], condition=models.Q(is_active=True), name='marketkey_unique_active_pair_key',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['asset1', 'is_active']),
+            models.Index(fields=['asset2', 'is_active']),
+        ]
+
     def __str__(self):
         return f'MarketKey - {self.asset1.code} - {self.asset2.code}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        market_key = super(MarketKey, cls).from_db(db, field_names, values)
+        # Assets stored pair key was built from, see save.
+        market_key._pair_key_asset_ids = (market_key.__dict__.get('asset1_id'), market_key.__dict__.get('asset2_id'))
+        return market_key
+
+    def save(self, *args, **kwargs):
+        # Pair key is rebuilt only when it may be outdated, so saving other fields doesn't load both assets.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            if getattr(self, '_pair_key_asset_ids', None) != (self.asset1_id, self.asset2_id):
+                self.pair_key = self.get_market_pair_key()
+        elif self.PAIR_KEY_FIELDS.intersection(update_fields):
+            self.pair_key = self.get_market_pair_key()
+            kwargs['update_fields'] = {*update_fields, 'pair_key'}
+
+        super(MarketKey, self).save(*args, **kwargs)
+        self._pair_key_asset_ids = (self.asset1_id, self.asset2_id)
+
     def get_market_pair(self):
         return MarketPair(
             self.asset1.get_stellar_asset(),
             self.asset2.get_stellar_asset(),
         )
 
+    def get_market_pair_key(self) -> str:
+        return get_pair_key(
+            get_asset_string_by_parts(self.asset1.code, self.asset1.issuer),
+            get_asset_string_by_parts(self.asset2.code, self.asset2.issuer),
+        )
+
     @property
     def is_banned(self):
         return self.asset1.is_banned or self.asset2.is_banned
 
     @cached_property
     def ban_reasons(self):
-        return set(AssetBan.objects.filter(
+        if hasattr(self.asset1, 'active_bans') and hasattr(self.asset2, 'active_bans'):
+            return {ban.reason for ban in self.asset1.active_bans + self.asset2.active_bans}
+
+        return set(AssetBan.objects.filter_active().filter(
             asset__in=[self.asset1, self.asset2],
-            status__in=[AssetBan.Status.BANNED, AssetBan.Status.FIXED],
         ).values_list('reason', flat=True))
 
     @property
@@ -171,11 +251,37 @@ class MarketKey(models.Model):
 
 
 class AssetBanQuerySet(models.QuerySet):
+    def filter_active(self):
+        # Fixed bans are still shown until unban term passes.
+        return self.filter(status__in=[self.model.Status.BANNED, self.model.Status.FIXED])
+
+    def get_reasons_map(self, asset_ids: Iterable[int]) -> Dict[int, Set[str]]:
+        reasons_map = {}
+        for asset_id, reason in self.filter(asset_id__in=list(asset_ids)).values_list('asset_id', 'reason'):
+            reasons_map.setdefault(asset_id, set()).add(reason)
+
+        return reasons_map
+
     def filter_for_unban(self):
         model = self.model
         now = timezone.now()
         return self.filter(status=model.Status.FIXED, fixed_at__lt=now - model.UNBAN_TERM)
 
+    def unban(self) -> int:
+        model = self.model
+        with atomic():
+            asset_ids = list(self.values_list('asset_id', flat=True).distinct())
+            unbanned_count = self.filter(asset_id__in=asset_ids).update(
+                status=model.Status.UNBANNED, unbanned_at=timezone.now(),
+            )
+
+            # Asset stays banned while it has other active bans.
+            Asset.objects.filter(id__in=asset_ids, is_banned=True).filter(
+                ~models.Exists(model.objects.filter(asset=models.OuterRef('pk'), status=model.Status.BANNED)),
+            ).update(is_banned=False)
+
+        return unbanned_count
+
 
 class AssetBan(models.Model):
     UNBAN_TERM = timezone.timedelta(days=7)
@@ -201,6 +307,11 @@ class AssetBan(models.Model):
 
     objects = AssetBanQuerySet.as_manager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'fixed_at']),
+        ]
+
     def __str__(self):
         return f'Ban for {self.asset}'
 
@@ -213,3 +324,23 @@ class AssetBan(models.Model):
             self.status = self.Status.UNBANNED
             self.unbanned_at = timezone.now()
             self.save()
+
+
+class SyncCursorQuerySet(models.QuerySet):
+    def get_cursor(self, name: str) -> Optional[str]:
+        return self.filter(name=name).values_list('cursor', flat=True).first()
+
+    def set_cursor(self, name: str, cursor: str):
+        self.update_or_create(name=name, defaults={'cursor': cursor})
+
+
+class SyncCursor(models.Model):
+    name = models.CharField(max_length=128, unique=True)
+    cursor = models.CharField(max_length=128)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SyncCursorQuerySet.as_manager()
+
+    def __str__(self):
+        return f'Sync cursor {self.name} - {self.cursor}'
@@ -1,9 +1,7 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
-class MarketKeyPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'limit'
+class MultiGetPageSizeMixin:
     max_page_size = 200
 
     def get_page_size(self, request):
@@ -12,4 +10,17 @@ class MarketKeyPagination(PageNumberPagination):
         if 'account_id' in request.query_params:
             return self.max_page_size
 
-        return super(MarketKeyPagination, self).get_page_size(request)
+        return super(MultiGetPageSizeMixin, self).get_page_size(request)
+
+
+class MarketKeyPagination(MultiGetPageSizeMixin, PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'limit'
+    max_page_size = 200
+
+
+class MarketKeyCursorPagination(MultiGetPageSizeMixin, CursorPagination):
+    page_size = 10
+    page_size_query_param = 'limit'
+    max_page_size = 200
+    ordering = 'id'
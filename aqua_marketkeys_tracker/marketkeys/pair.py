@@ -3,6 +3,10 @@ from stellar_sdk import Asset
 from aqua_marketkeys_tracker.utils.stellar.asset import get_asset_string
 
 
+def get_pair_key(asset1_string: str, asset2_string: str) -> str:
+    return '-'.join(sorted([asset1_string, asset2_string]))
+
+
 class MarketPair:
     asset1: Asset
     asset2: Asset
@@ -20,7 +24,9 @@ class MarketPair:
             or (self.asset1 == other.asset2 and self.asset2 == other.asset1)
         )
 
+    @property
+    def key(self) -> str:
+        return get_pair_key(get_asset_string(self.asset1), get_asset_string(self.asset2))
+
     def __hash__(self):
-        asset1_string = get_asset_string(self.asset1)
-        asset2_string = get_asset_string(self.asset2)
-        return hash('-'.join(sorted([asset1_string, asset2_string])))
+        return hash(self.key)
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from django.conf import settings
 
 from dateutil.parser import parse as date_parse
@@ -80,13 +82,41 @@ class MarketKeyParser:
         if asset_string in self.assets_cache:
             return self.assets_cache[asset_string]
 
-        code = asset.code
-        issuer = asset.issuer or ''
-        # TODO: Refactor to bulk create if needed.
-        self.assets_cache[asset_string] = Asset.objects.get_or_create(code=code, issuer=issuer)[0]
+        self.assets_cache[asset_string] = Asset.objects.get_or_create(
+            asset_string=asset_string, defaults={'code': asset.code, 'issuer': asset.issuer or ''},
+        )[0]
 
         return self.assets_cache[asset_string]
 
+    def load_asset_objects(self, assets: Iterable[StellarAsset]):
+        missing_assets = {}
+        for asset in assets:
+            asset_string = get_asset_string(asset)
+            if asset_string not in self.assets_cache:
+                missing_assets[asset_string] = asset
+
+        if not missing_assets:
+            return
+
+        Asset.objects.bulk_create([
+            Asset(code=asset.code, issuer=asset.issuer or '', asset_string=asset_string)
+            for asset_string, asset in missing_assets.items()
+        ], ignore_conflicts=True)
+
+        for asset_object in Asset.objects.filter(asset_string__in=list(missing_assets)):
+            self.assets_cache[asset_object.asset_string] = asset_object
+
+    def load_accounts_assets(self, accounts_info: Iterable[dict]):
+        assets = []
+        for account_info in accounts_info:
+            try:
+                self.verify_signers(account_info)
+                assets.extend(self.parse_market_assets(account_info))
+            except MarketKeyParsingError:
+                continue
+
+        self.load_asset_objects(assets)
+
     def verify_signers(self, account_info: dict):
         signers = account_info['signers']
         thresholds = account_info['thresholds']
@@ -130,9 +160,12 @@ class MarketKeyParser:
         asset1 = self.get_asset_object(asset1)
         asset2 = self.get_asset_object(asset2)
 
-        return MarketKey(
+        market_key = MarketKey(
             account_id=account_id,
             asset1=asset1,
             asset2=asset2,
             locked_at=date_parse(last_modified_time) if last_modified_time else None,
         )
+        market_key.pair_key = market_key.get_market_pair_key()
+
+        return market_key
@@ -1,7 +1,8 @@
+from typing import List
+
 from rest_framework import serializers
 
-from aqua_marketkeys_tracker.marketkeys.models import MarketKey
-from aqua_marketkeys_tracker.utils.stellar.asset import get_asset_string
+from aqua_marketkeys_tracker.marketkeys.models import AssetBan, MarketKey
 
 
 class MarketKeySerializer(serializers.ModelSerializer):
@@ -36,7 +37,81 @@ class MarketKeySerializer(serializers.ModelSerializer):
                   'created_at', 'locked_at']
 
     def get_asset1(self, obj):
-        return get_asset_string(obj.asset1.get_stellar_asset())
+        return obj.asset1.asset_string
 
     def get_asset2(self, obj):
-        return get_asset_string(obj.asset2.get_stellar_asset())
+        return obj.asset2.asset_string
+
+
+class MarketKeyRowListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        rows = list(data)
+        self.child.load_ban_reasons(rows)
+        return [self.child.to_representation(row) for row in rows]
+
+
+class MarketKeyRowSerializer(serializers.BaseSerializer):
+    # Same output as MarketKeySerializer, but built from values() rows for list endpoints.
+    # Skips model instances, which dominate serialization time of large pages.
+    row_fields = [
+        'id', 'account_id', 'downvote_account_id', 'created_at', 'locked_at',
+        'asset1_id', 'asset1__asset_string', 'asset1__code', 'asset1__issuer', 'asset1__is_banned',
+        'asset1__voting_boost', 'asset1__voting_boost_cap',
+        'asset2_id', 'asset2__asset_string', 'asset2__code', 'asset2__issuer', 'asset2__is_banned',
+        'asset2__voting_boost', 'asset2__voting_boost_cap',
+    ]
+
+    voting_boost_field = serializers.DecimalField(max_digits=5, decimal_places=4)
+    datetime_field = serializers.DateTimeField()
+
+    class Meta:
+        list_serializer_class = MarketKeyRowListSerializer
+
+    def __init__(self, *args, **kwargs):
+        super(MarketKeyRowSerializer, self).__init__(*args, **kwargs)
+        self.ban_reasons_map = {}
+
+    def load_ban_reasons(self, rows: List[dict]):
+        # Reasons matter only for banned assets, same as in MarketKey properties.
+        banned_asset_ids = set()
+        for row in rows:
+            if row['asset1__is_banned']:
+                banned_asset_ids.add(row['asset1_id'])
+            if row['asset2__is_banned']:
+                banned_asset_ids.add(row['asset2_id'])
+
+        self.ban_reasons_map = {}
+        if banned_asset_ids:
+            self.ban_reasons_map = AssetBan.objects.filter_active().get_reasons_map(banned_asset_ids)
+
+    def to_representation(self, row):
+        is_banned = row['asset1__is_banned'] or row['asset2__is_banned']
+        ban_reasons = set()
+        if is_banned:
+            ban_reasons = self.ban_reasons_map.get(row['asset1_id'], set()).union(
+                self.ban_reasons_map.get(row['asset2_id'], set()),
+            )
+
+        boosted_asset = 'asset1' if row['asset1__voting_boost'] > row['asset2__voting_boost'] else 'asset2'
+
+        return {
+            'id': row['id'],
+            'account_id': row['account_id'],
+            'upvote_account_id': row['account_id'],
+            'downvote_account_id': row['downvote_account_id'],
+            'asset1': row['asset1__asset_string'],
+            'asset1_code': row['asset1__code'],
+            'asset1_issuer': row['asset1__issuer'],
+            'asset2': row['asset2__asset_string'],
+            'asset2_code': row['asset2__code'],
+            'asset2_issuer': row['asset2__issuer'],
+            'is_banned': is_banned,
+            'auth_required': AssetBan.Reason.AUTH_REQUIRED in ban_reasons,
+            'auth_revocable': AssetBan.Reason.AUTH_REVOCABLE in ban_reasons,
+            'auth_clawback_enabled': AssetBan.Reason.AUTH_CLAWBACK_ENABLED in ban_reasons,
+            'no_liquidity': AssetBan.Reason.ISOLATED_MARKET in ban_reasons,
+            'voting_boost': self.voting_boost_field.to_representation(row[f'{boosted_asset}__voting_boost']),
+            'voting_boost_cap': self.voting_boost_field.to_representation(row[f'{boosted_asset}__voting_boost_cap']),
+            'created_at': self.datetime_field.to_representation(row['created_at']),
+            'locked_at': self.datetime_field.to_representation(row['locked_at']),
+        }
@@ -0,0 +1,126 @@
+import gzip
+from typing import List, Optional
+
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import quote_etag
+
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from aqua_marketkeys_tracker.marketkeys.cache import get_dataset_version, get_request_fingerprint
+from aqua_marketkeys_tracker.marketkeys.models import MarketKey
+from aqua_marketkeys_tracker.marketkeys.serializers import MarketKeyRowSerializer
+from aqua_marketkeys_tracker.utils.metrics import api_cache_requests
+
+
+SNAPSHOT_CACHE_KEY = 'marketkeys:snapshot'
+SNAPSHOT_VERSION_CACHE_KEY = 'marketkeys:snapshot_version'
+
+SNAPSHOT_BODY_CACHE_KEY_PREFIX = 'marketkeys:snapshot_body'
+SNAPSHOT_BODY_CACHE_TIMEOUT = 60 * 60
+
+
+class MarketKeySnapshot:
+    # Serialized default market keys listing, stamped with dataset version it was built for. The version is also kept
+    # under its own key, so requests served from page bodies cache never load the whole listing.
+    def get_queryset(self):
+        return MarketKey.objects.order_by('id').filter_active().filter_listed().values(
+            *MarketKeyRowSerializer.row_fields,
+        )
+
+    def build(self) -> List[dict]:
+        return list(MarketKeyRowSerializer(self.get_queryset(), many=True).data)
+
+    def refresh(self) -> bool:
+        # Version is taken before build, so a change made during build leaves the snapshot outdated, not wrong.
+        dataset_version = get_dataset_version()
+
+        # Rows are checked too, as the largest key they may be evicted while the version key stays.
+        if self.get_version() == dataset_version and self.get_rows(dataset_version) is not None:
+            return False
+
+        # Rows go first, so the version never points to rows which are not stored yet.
+        cache.set(SNAPSHOT_CACHE_KEY, {'version': dataset_version, 'rows': self.build()}, timeout=None)
+        cache.set(SNAPSHOT_VERSION_CACHE_KEY, dataset_version, timeout=None)
+        return True
+
+    def get_version(self) -> Optional[int]:
+        return cache.get(SNAPSHOT_VERSION_CACHE_KEY)
+
+    def get_rows(self, dataset_version: int) -> Optional[List[dict]]:
+        snapshot = cache.get(SNAPSHOT_CACHE_KEY)
+        if not snapshot or snapshot['version'] != dataset_version:
+            return None
+
+        return snapshot['rows']
+
+
+class SnapshotResponseMixin:
+    snapshot_body_cache_timeout = SNAPSHOT_BODY_CACHE_TIMEOUT
+
+    def get_snapshot_body_cache_key(self, dataset_version: int, fingerprint: str) -> str:
+        return f'{SNAPSHOT_BODY_CACHE_KEY_PREFIX}:{dataset_version}:{fingerprint}'
+
+    def get_snapshot_etag(self, dataset_version: int, fingerprint: str, accepts_gzip: bool) -> str:
+        # Compressed body is a different representation, so it gets its own etag.
+        return quote_etag(f'{dataset_version}-{fingerprint[:32]}' + ('-gzip' if accepts_gzip else ''))
+
+    def is_snapshot_request(self, request) -> bool:
+        return isinstance(request.accepted_renderer, JSONRenderer)
+
+    def get_snapshot_bodies(self, request, rows: List[dict]) -> dict:
+        page = self.paginate_queryset(rows)
+        body = request.accepted_renderer.render(self.get_paginated_response(page).data)
+        return {
+            'identity': body,
+            'gzip': gzip.compress(body),
+        }
+
+    def get_snapshot_not_modified_response(self, etag: str) -> HttpResponse:
+        api_cache_requests.labels('not_modified').inc()
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+    def get_snapshot_response(self, request: HttpRequest) -> Optional[HttpResponse]:
+        snapshot = MarketKeySnapshot()
+        dataset_version = get_dataset_version()
+        if snapshot.get_version() != dataset_version:
+            return None
+
+        fingerprint = get_request_fingerprint(request)
+        accepts_gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        etag = self.get_snapshot_etag(dataset_version, fingerprint, accepts_gzip)
+        if self.is_not_modified(request, etag):
+            return self.get_snapshot_not_modified_response(etag)
+
+        # Page links depend on request host and params, so page bodies are composed on first request.
+        cache_key = self.get_snapshot_body_cache_key(dataset_version, fingerprint)
+        bodies = cache.get(cache_key)
+        if bodies is None:
+            rows = snapshot.get_rows(dataset_version)
+            if rows is None:
+                return None
+
+            api_cache_requests.labels('snapshot_miss').inc()
+            bodies = self.get_snapshot_bodies(request, rows)
+            cache.set(cache_key, bodies, self.snapshot_body_cache_timeout)
+        else:
+            api_cache_requests.labels('snapshot_hit').inc()
+
+        # Bodies are composed for existing pages only, out of range ones fail pagination.
+        if self.is_not_modified(request, etag, exists=True):
+            return self.get_snapshot_not_modified_response(etag)
+
+        response = HttpResponse(
+            bodies['gzip'] if accepts_gzip else bodies['identity'],
+            content_type=request.accepted_renderer.media_type,
+            headers={'ETag': etag},
+        )
+        if accepts_gzip:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+
+        return response
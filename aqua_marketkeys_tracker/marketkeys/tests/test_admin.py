@@ -0,0 +1,24 @@
+from django.contrib.admin import site
+from django.core.cache import cache
+from django.test import TestCase
+
+from aqua_marketkeys_tracker.marketkeys.admin import MarketKeyAdmin
+from aqua_marketkeys_tracker.marketkeys.benchmarks.data import create_assets, create_market_keys, get_native_asset
+from aqua_marketkeys_tracker.marketkeys.cache import get_dataset_version
+from aqua_marketkeys_tracker.marketkeys.models import MarketKey
+
+
+class MarketKeyAdminTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        create_market_keys((get_native_asset(), asset) for asset in create_assets(3))
+        self.model_admin = MarketKeyAdmin(MarketKey, site)
+
+    def test_delete_queryset_bumps_dataset_version(self):
+        dataset_version = get_dataset_version()
+
+        self.model_admin.delete_queryset(None, MarketKey.objects.all())
+
+        self.assertFalse(MarketKey.objects.exists())
+        self.assertGreater(get_dataset_version(), dataset_version)
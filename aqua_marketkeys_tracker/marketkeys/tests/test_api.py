@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from aqua_marketkeys_tracker.marketkeys.benchmarks.data import create_assets, create_market_keys, get_native_asset
+from aqua_marketkeys_tracker.marketkeys.snapshot import SNAPSHOT_CACHE_KEY, MarketKeySnapshot
+
+
+class RetrieveMarketKeyViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.native_asset = get_native_asset()
+        self.asset, self.missing_asset = create_assets(2)
+        create_market_keys([(self.native_asset, self.asset)])
+
+        self.client = APIClient()
+
+    def get_url(self, asset) -> str:
+        return f'/api/market-keys/native-{asset}/'
+
+    def test_any_etag_not_modified(self):
+        response = self.client.get(self.get_url(self.asset), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Cached response is answered the same way.
+        response = self.client.get(self.get_url(self.asset), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_any_etag_missing_market_key(self):
+        response = self.client.get(self.get_url(self.missing_asset), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_etag_not_modified(self):
+        etag = self.client.get(self.get_url(self.asset))['ETag']
+
+        response = self.client.get(self.get_url(self.asset), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class ListMarketKeySnapshotTestCase(TestCase):
+    URL = '/api/market-keys/'
+
+    def setUp(self):
+        cache.clear()
+
+        create_market_keys((get_native_asset(), asset) for asset in create_assets(5))
+        MarketKeySnapshot().refresh()
+
+        self.client = APIClient()
+
+    def test_gzip_etag(self):
+        identity_response = self.client.get(self.URL)
+        gzip_response = self.client.get(self.URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(gzip_response['Content-Encoding'], 'gzip')
+        self.assertNotEqual(identity_response['ETag'], gzip_response['ETag'])
+
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=identity_response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(self.URL, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=identity_response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_rows_loaded_on_body_miss_only(self):
+        with mock.patch.object(MarketKeySnapshot, 'get_rows', wraps=MarketKeySnapshot().get_rows) as get_rows:
+            etag = self.client.get(self.URL)['ETag']
+            self.client.get(self.URL)
+            response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(get_rows.call_count, 1)
+
+    def test_any_etag_missing_page(self):
+        response = self.client.get(self.URL, {'page': 100}, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_refresh_evicted_rows(self):
+        cache.delete(SNAPSHOT_CACHE_KEY)
+
+        self.assertTrue(MarketKeySnapshot().refresh())
+        self.assertFalse(MarketKeySnapshot().refresh())
+
+        with mock.patch.object(MarketKeySnapshot, 'get_rows', wraps=MarketKeySnapshot().get_rows) as get_rows:
+            self.assertEqual(self.client.get(self.URL).status_code, status.HTTP_200_OK)
+
+        self.assertEqual(get_rows.call_count, 1)
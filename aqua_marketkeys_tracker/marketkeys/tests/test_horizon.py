@@ -0,0 +1,93 @@
+from typing import List
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from stellar_sdk import Keypair
+from stellar_sdk.exceptions import BadRequestError, BadResponseError, NotFoundError
+
+from aqua_marketkeys_tracker.marketkeys.benchmarks.servers import FakeHorizon
+from aqua_marketkeys_tracker.utils.stellar.horizon import HORIZON_MAX_RETRIES, get_horizon_server
+from aqua_marketkeys_tracker.utils.stellar.requests import PAGE_RETRIES, load_all_pages
+
+
+class FlakyHorizon(FakeHorizon):
+    # Answers accounts requests with given error statuses first, requests with cursor only if resume_failures set.
+    def __init__(self, failures: List[int], resume_failures: bool = False, **kwargs):
+        super(FlakyHorizon, self).__init__(**kwargs)
+        self.failures = list(failures)
+        self.resume_failures = resume_failures
+        self.cursors = []
+
+    def handle(self, path, query):
+        if path == '/accounts':
+            cursor = query.get('cursor', [None])[0]
+            self.cursors.append(cursor)
+            if self.failures and (cursor or not self.resume_failures):
+                return self.failures.pop(0), {'status': 'error'}
+
+        return super(FlakyHorizon, self).handle(path, query)
+
+
+@mock.patch('time.sleep')
+class LoadAllPagesTestCase(SimpleTestCase):
+    MARKER_KEY = Keypair.random().public_key
+    PAGE_SIZE = 10
+
+    def get_accounts(self, count: int) -> List[dict]:
+        accounts = []
+        for _ in range(count):
+            account_id = Keypair.random().public_key
+            accounts.append({
+                'account_id': account_id,
+                'paging_token': account_id,
+                'signers': [{'key': self.MARKER_KEY, 'weight': 1}],
+            })
+
+        return accounts
+
+    def load_account_ids(self, horizon: FakeHorizon) -> List[str]:
+        request_builder = get_horizon_server(horizon.url).accounts().for_signer(self.MARKER_KEY).order(desc=False)
+        return [
+            account_info['account_id']
+            for records in load_all_pages(request_builder, page_size=self.PAGE_SIZE)
+            for account_info in records
+        ]
+
+    def test_resume_after_server_errors(self, sleep):
+        accounts = self.get_accounts(25)
+        # Client retries of the second page are exhausted once, then the page is loaded again from its cursor.
+        with FlakyHorizon([503] * (HORIZON_MAX_RETRIES + 1), resume_failures=True, accounts=accounts) as horizon:
+            with self.assertLogs('aqua_marketkeys_tracker.utils.stellar.requests', 'WARNING'):
+                account_ids = self.load_account_ids(horizon)
+
+        self.assertEqual(account_ids, [account_info['account_id'] for account_info in horizon.accounts])
+        self.assertEqual(horizon.cursors.count(None), 1)
+        self.assertEqual(horizon.cursors.count(horizon.accounts[self.PAGE_SIZE - 1]['paging_token']),
+                         HORIZON_MAX_RETRIES + 2)
+
+    def test_retry_rate_limit(self, sleep):
+        with FlakyHorizon([429, 429], accounts=self.get_accounts(5)) as horizon:
+            account_ids = self.load_account_ids(horizon)
+
+        self.assertEqual(len(account_ids), 5)
+        self.assertEqual(len(horizon.cursors), 3)
+
+    def test_server_errors_exhausted(self, sleep):
+        attempts = (HORIZON_MAX_RETRIES + 1) * (PAGE_RETRIES + 1)
+        with FlakyHorizon([500] * attempts, accounts=self.get_accounts(5)) as horizon:
+            with self.assertRaises(BadResponseError), self.assertLogs('aqua_marketkeys_tracker.utils.stellar.requests'):
+                self.load_account_ids(horizon)
+
+        self.assertEqual(len(horizon.cursors), attempts)
+
+    def test_client_errors_not_retried(self, sleep):
+        for status_code, exception_class in ((400, BadRequestError), (404, NotFoundError)):
+            with FlakyHorizon([status_code], accounts=self.get_accounts(5)) as horizon:
+                with self.assertRaises(exception_class):
+                    self.load_account_ids(horizon)
+
+            self.assertEqual(len(horizon.cursors), 1)
+
+        # Fake server sleeps for its zero latency only.
+        self.assertFalse(any(call.args[0] for call in sleep.call_args_list))
@@ -0,0 +1,61 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+
+from aqua_marketkeys_tracker.marketkeys.benchmarks.data import create_assets
+from aqua_marketkeys_tracker.marketkeys.benchmarks.servers import FakeHorizon
+from aqua_marketkeys_tracker.marketkeys.loaders.market_isolation import MarketIsolationLoader
+from aqua_marketkeys_tracker.marketkeys.models import Asset
+
+
+class MarketIsolationLoaderTestCase(TestCase):
+    ASSETS_COUNT = 200
+
+    def setUp(self):
+        self.assets = create_assets(self.ASSETS_COUNT)
+
+    def get_loader(self, horizon: FakeHorizon) -> MarketIsolationLoader:
+        loader = MarketIsolationLoader()
+        loader.HORIZON_URL = horizon.url
+        loader.WRITE_BATCH_SIZE = 10
+        return loader
+
+    def test_run(self):
+        isolated_assets = {str(asset) for asset in self.assets[::4]}
+        with FakeHorizon(isolated_assets=isolated_assets) as horizon:
+            self.get_loader(horizon).run()
+
+        self.assertEqual(horizon.total_requests, self.ASSETS_COUNT)
+        self.assertEqual(
+            set(Asset.objects.filter(is_banned=True).values_list('asset_string', flat=True)), isolated_assets,
+        )
+
+    def test_writer_failure_cancels_checks(self):
+        with FakeHorizon(latency=lambda: 0.01) as horizon:
+            loader = self.get_loader(horizon)
+            with mock.patch.object(loader, 'process_assets', side_effect=DatabaseError):
+                with self.assertRaises(DatabaseError):
+                    loader.run()
+
+            requests_count = horizon.total_requests
+
+        self.assertLess(requests_count, self.ASSETS_COUNT)
+        self.assertFalse(Asset.objects.filter(is_banned=True).exists())
+
+    def test_recheck_after_min_interval(self):
+        started_at = timezone.now()
+        # Second run comes a minute later, third one slightly earlier than a full interval after the first.
+        run_delays = [
+            timezone.timedelta(0),
+            timezone.timedelta(minutes=1),
+            MarketIsolationLoader.MIN_CHECK_INTERVAL - timezone.timedelta(seconds=1),
+        ]
+        with FakeHorizon() as horizon:
+            for run_delay in run_delays:
+                with mock.patch('django.utils.timezone.now', return_value=started_at + run_delay):
+                    self.get_loader(horizon).run()
+
+        # Second run finds nothing due, the third one checks all assets again.
+        self.assertEqual(horizon.total_requests, 2 * self.ASSETS_COUNT)
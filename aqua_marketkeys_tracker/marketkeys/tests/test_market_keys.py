@@ -0,0 +1,57 @@
+from typing import List
+
+from django.conf import settings
+from django.test import TestCase
+
+from stellar_sdk import Asset as StellarAsset
+
+from aqua_marketkeys_tracker.marketkeys.benchmarks.data import generate_stellar_assets, get_account_info
+from aqua_marketkeys_tracker.marketkeys.benchmarks.servers import FakeHorizon
+from aqua_marketkeys_tracker.marketkeys.loaders.market_keys import MarketKeyLoader
+from aqua_marketkeys_tracker.marketkeys.models import MarketKey
+from aqua_marketkeys_tracker.marketkeys.parser import MarketKeyParser
+
+
+class MarketKeyLoaderTestCase(TestCase):
+    def setUp(self):
+        self.marker_key = settings.UPVOTE_MARKET_KEY_MARKER
+        self.loader = MarketKeyLoader(self.marker_key, MarketKeyParser(self.marker_key, NotImplemented))
+
+    def get_accounts(self, count: int) -> List[dict]:
+        return [
+            get_account_info(self.marker_key, StellarAsset.native(), asset)
+            for asset in generate_stellar_assets(count)
+        ]
+
+    def test_parse_market_keys_page_queries(self):
+        # Known keys lookup, assets insert and assets fetch, whatever the page size is.
+        for count in (10, 50):
+            records = self.get_accounts(count)
+            with self.assertNumQueries(3):
+                market_keys = self.loader.parse_market_keys_page(records)
+
+            self.assertEqual(len(market_keys), count)
+
+    def test_parse_market_keys_page_skips_known_accounts(self):
+        records = self.get_accounts(10)
+        self.loader.save_market_keys(self.loader.parse_market_keys_page(records[:5]))
+
+        with self.assertNumQueries(3):
+            market_keys = self.loader.parse_market_keys_page(records)
+
+        self.assertEqual(
+            {market_key.account_id for market_key in market_keys},
+            {account_info['account_id'] for account_info in records[5:]},
+        )
+
+    def test_load_market_keys_queries(self):
+        records = self.get_accounts(30)
+        self.loader.MARKET_KEYS_PAGE_LIMIT = 10
+
+        with FakeHorizon(accounts=records) as horizon:
+            self.loader.HORIZON_URL = horizon.url
+            # Three queries per page, then stored pairs lookup and keys insert.
+            with self.assertNumQueries(3 * 3 + 2):
+                self.loader.load_market_keys()
+
+        self.assertEqual(MarketKey.objects.filter_active().count(), len(records))
@@ -0,0 +1,108 @@
+from typing import List, Tuple
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+
+from stellar_sdk import Asset as StellarAsset
+
+from aqua_marketkeys_tracker.marketkeys.benchmarks.data import generate_stellar_assets, get_account_info
+from aqua_marketkeys_tracker.marketkeys.benchmarks.servers import FakeHorizon
+from aqua_marketkeys_tracker.marketkeys.cache import get_dataset_version
+from aqua_marketkeys_tracker.marketkeys.loaders.market_keys import DownvoteMarketKeyLoader, MarketKeyLoader
+from aqua_marketkeys_tracker.marketkeys.loaders.market_keys_stream import MarketKeyStreamer
+from aqua_marketkeys_tracker.marketkeys.models import MarketKey, SyncCursor
+from aqua_marketkeys_tracker.marketkeys.parser import MarketKeyParser
+from aqua_marketkeys_tracker.marketkeys.snapshot import MarketKeySnapshot
+
+
+class MarketKeyStreamerTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.upvote_marker = settings.UPVOTE_MARKET_KEY_MARKER
+        self.downvote_marker = settings.DOWNVOTE_MARKET_KEY_MARKER
+        self.upvote_loader = MarketKeyLoader(self.upvote_marker, MarketKeyParser(self.upvote_marker, NotImplemented))
+        self.downvote_loader = DownvoteMarketKeyLoader(
+            self.downvote_marker, MarketKeyParser(self.downvote_marker, NotImplemented),
+        )
+
+        self.assets = generate_stellar_assets(3)
+        self.upvote_accounts = [
+            get_account_info(self.upvote_marker, StellarAsset.native(), asset) for asset in self.assets
+        ]
+        self.downvote_accounts = [
+            get_account_info(self.downvote_marker, StellarAsset.native(), asset) for asset in self.assets
+        ]
+
+    def get_effects(self, accounts: List[Tuple[dict, str]]) -> List[dict]:
+        return [
+            {
+                'id': f'{index:019d}-1',
+                'paging_token': f'{index:019d}-1',
+                'type': 'signer_created',
+                'account': account_info['account_id'],
+                'public_key': marker_key,
+                'weight': settings.MARKET_KEY_SIGNER_WEIGHT,
+            }
+            for index, (account_info, marker_key) in enumerate(accounts, start=1)
+        ]
+
+    def run_streamer(self, horizon: FakeHorizon, max_events: int):
+        streamer = MarketKeyStreamer([self.upvote_loader, self.downvote_loader])
+        streamer.HORIZON_URL = horizon.url
+        streamer.run(max_events=max_events)
+
+    def test_run(self):
+        # Upvote keys are created first, so downvote accounts have keys to be linked to.
+        effects = self.get_effects(
+            [(account_info, self.upvote_marker) for account_info in self.upvote_accounts]
+            + [(account_info, self.downvote_marker) for account_info in self.downvote_accounts],
+        )
+
+        with FakeHorizon(accounts=self.upvote_accounts + self.downvote_accounts, effects=effects) as horizon:
+            self.run_streamer(horizon, max_events=len(effects))
+
+        self.assertEqual(
+            set(MarketKey.objects.filter_active().values_list('account_id', 'downvote_account_id')),
+            {
+                (upvote_account['account_id'], downvote_account['account_id'])
+                for upvote_account, downvote_account in zip(self.upvote_accounts, self.downvote_accounts)
+            },
+        )
+        self.assertEqual(SyncCursor.objects.get_cursor(MarketKeyStreamer.SYNC_CURSOR_NAME), effects[-1]['paging_token'])
+
+    def test_run_skips_known_accounts(self):
+        # Polling task has already stored part of the accounts.
+        self.upvote_loader.process_accounts(self.upvote_accounts[:2])
+        effects = self.get_effects([(account_info, self.upvote_marker) for account_info in self.upvote_accounts])
+
+        with FakeHorizon(accounts=self.upvote_accounts, effects=effects) as horizon:
+            self.run_streamer(horizon, max_events=len(effects))
+
+        self.assertEqual(MarketKey.objects.filter_active().count(), len(self.upvote_accounts))
+
+    def test_snapshot_refresh_debounced(self):
+        effects = self.get_effects([(account_info, self.upvote_marker) for account_info in self.upvote_accounts])
+
+        refresh_patch = mock.patch.object(
+            MarketKeySnapshot, 'refresh', autospec=True, side_effect=MarketKeySnapshot.refresh,
+        )
+        with FakeHorizon(accounts=self.upvote_accounts, effects=effects) as horizon, refresh_patch as refresh:
+            self.run_streamer(horizon, max_events=len(effects))
+
+        # First key is published right away, the rest once the stream stops.
+        self.assertEqual(refresh.call_count, 2)
+        self.assertEqual(MarketKeySnapshot().get_version(), get_dataset_version())
+
+    def test_save_market_keys_ignores_stored_accounts(self):
+        # Both writers parsed the same accounts before either of them stored the keys.
+        stream_market_keys = self.upvote_loader.parse_market_keys_page(self.upvote_accounts)
+        polling_market_keys = self.upvote_loader.parse_market_keys_page(self.upvote_accounts)
+
+        self.upvote_loader.save_market_keys(stream_market_keys)
+        self.upvote_loader.save_market_keys(polling_market_keys)
+
+        self.assertEqual(MarketKey.objects.count(), len(self.upvote_accounts))
+        self.assertEqual(MarketKey.objects.filter_active().count(), len(self.upvote_accounts))
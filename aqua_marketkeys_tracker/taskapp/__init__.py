@@ -4,17 +4,23 @@ from django.conf import settings
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_shutdown
+
+from aqua_marketkeys_tracker.utils.metrics.celery import mark_metrics_process_dead, start_metrics_exporter
 
 
 if not settings.configured:
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.dev')
 
-app = Celery('aqua_marketkeys_tracker')
+app = Celery('aqua_marketkeys_tracker', task_cls='aqua_marketkeys_tracker.utils.metrics.celery:MeasuredTask')
 
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS)
 app.conf.timezone = 'UTC'
 
+worker_init.connect(start_metrics_exporter)
+worker_process_shutdown.connect(mark_metrics_process_dead)
+
 
 @app.on_after_finalize.connect
 def setup_periodic_tasks(sender, **kwargs):
@@ -0,0 +1,132 @@
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, List, Tuple
+
+from django.core.cache import cache
+
+from django_redis import get_redis_connection
+from redis.exceptions import LockError
+
+from aqua_marketkeys_tracker.utils.metrics import task_skipped
+
+
+logger = logging.getLogger(__name__)
+
+
+LOCK_KEY_PREFIX = 'taskapp:lock'
+PENDING_CALLS_KEY_PREFIX = 'taskapp:pending'
+
+SINGLE_FLIGHT_TIMEOUT = 5 * 60
+SINGLE_FLIGHT_HEARTBEAT = 60
+
+
+class LockHeartbeat(threading.Thread):
+    def __init__(self, lock, timeout: int, interval: int):
+        super(LockHeartbeat, self).__init__(daemon=True)
+        self.lock = lock
+        self.timeout = timeout
+        self.interval = interval
+
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.lock.extend(self.timeout, replace_ttl=True)
+            except LockError:
+                logger.error('Lock %s is lost, task may run concurrently.', self.lock.name)
+                return
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def get_lock(name: str, timeout: int):
+    # Lock token is shared with heartbeat thread, redis locks keep it thread local by default.
+    return cache.lock(f'{LOCK_KEY_PREFIX}:{name}', timeout=timeout, thread_local=False)
+
+
+def release_lock(lock, lock_heartbeat: LockHeartbeat):
+    lock_heartbeat.stop()
+    try:
+        lock.release()
+    except LockError:
+        pass
+
+
+@contextmanager
+def hold_lock(name: str, timeout: int = SINGLE_FLIGHT_TIMEOUT, heartbeat: int = SINGLE_FLIGHT_HEARTBEAT):
+    # Waits for the lock instead of skipping, for sections shared by several writers.
+    lock = get_lock(name, timeout)
+    lock.acquire(blocking=True)
+
+    lock_heartbeat = LockHeartbeat(lock, timeout, heartbeat)
+    lock_heartbeat.start()
+    try:
+        yield
+    finally:
+        release_lock(lock, lock_heartbeat)
+
+
+def add_pending_call(key: str, args: tuple, kwargs: dict):
+    # Task arguments are json serializable anyway, as celery sends them in json.
+    get_redis_connection().rpush(key, json.dumps([args, kwargs], sort_keys=True))
+
+
+def pop_pending_calls(key: str) -> List[Tuple[tuple, dict]]:
+    # Read and delete in one transaction, so calls pushed meanwhile are neither lost nor run twice.
+    pipeline = get_redis_connection().pipeline()
+    pipeline.lrange(key, 0, -1)
+    pipeline.delete(key)
+    raw_pending_calls, _ = pipeline.execute()
+
+    pending_calls = []
+    for raw_pending_call in dict.fromkeys(raw_pending_calls):
+        args, kwargs = json.loads(raw_pending_call)
+        pending_calls.append((tuple(args), kwargs))
+
+    return pending_calls
+
+
+def single_flight(timeout: int = SINGLE_FLIGHT_TIMEOUT, heartbeat: int = SINGLE_FLIGHT_HEARTBEAT,
+                  coalesce: bool = False) -> Callable:
+    # Only one run of the task at a time across all workers. Lock expires after timeout unless extended by heartbeat,
+    # so a killed worker doesn't block the task. Overlapping runs are skipped, or with coalesce run after current one.
+    def decorator(func: Callable) -> Callable:
+        task_name = f'{func.__module__}.{func.__name__}'
+        pending_calls_key = f'{PENDING_CALLS_KEY_PREFIX}:{task_name}'
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            lock = get_lock(task_name, timeout)
+            if not lock.acquire(blocking=False):
+                logger.warning('Task %s skipped, previous run is still in progress.', task_name)
+                task_skipped.labels(task_name).inc()
+                if coalesce:
+                    add_pending_call(pending_calls_key, args, kwargs)
+                return
+
+            lock_heartbeat = LockHeartbeat(lock, timeout, heartbeat)
+            lock_heartbeat.start()
+            try:
+                result = func(*args, **kwargs)
+
+                pending_calls = pop_pending_calls(pending_calls_key) if coalesce else []
+                while pending_calls:
+                    for pending_args, pending_kwargs in pending_calls:
+                        logger.info('Running coalesced call of task %s.', task_name)
+                        func(*pending_args, **pending_kwargs)
+
+                    pending_calls = pop_pending_calls(pending_calls_key)
+
+                return result
+            finally:
+                release_lock(lock, lock_heartbeat)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,54 @@
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from aqua_marketkeys_tracker.taskapp.locks import single_flight
+
+
+class SingleFlightTestCase(SimpleTestCase):
+    def setUp(self):
+        self.runs = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run_in_thread(self, task, *args) -> threading.Thread:
+        thread = threading.Thread(target=task, args=args)
+        thread.start()
+        self.assertTrue(self.started.wait(5))
+        return thread
+
+    def test_heartbeat_keeps_lock(self):
+        @single_flight(timeout=1, heartbeat=0.2)
+        def task(name):
+            self.runs.append(name)
+            self.started.set()
+            self.release.wait(5)
+
+        thread = self.run_in_thread(task, 'first')
+        # Lock would have expired by now without heartbeat.
+        time.sleep(2)
+        task('overlapping')
+
+        self.release.set()
+        thread.join()
+        task('next')
+
+        self.assertEqual(self.runs, ['first', 'next'])
+
+    def test_coalesce(self):
+        @single_flight(timeout=5, heartbeat=1, coalesce=True)
+        def task(name):
+            self.runs.append(name)
+            self.started.set()
+            self.release.wait(5)
+
+        thread = self.run_in_thread(task, 'first')
+        task('pending')
+        task('pending')
+        task(name='other')
+
+        self.release.set()
+        thread.join()
+
+        self.assertEqual(self.runs, ['first', 'pending', 'other'])
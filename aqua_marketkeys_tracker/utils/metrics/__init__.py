@@ -0,0 +1,87 @@
+import os
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
+
+
+DB_QUERIES_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+TASK_DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1200, 3600)
+
+
+task_duration = Histogram(
+    'marketkeys_task_duration_seconds', 'Celery task run duration.',
+    ['task', 'outcome'], buckets=TASK_DURATION_BUCKETS,
+)
+task_skipped = Counter(
+    'marketkeys_task_skipped', 'Task runs skipped because previous run is in progress.',
+    ['task'],
+)
+db_queries = Histogram(
+    'marketkeys_db_queries', 'DB queries per task run or api request.',
+    ['scope', 'name'], buckets=DB_QUERIES_BUCKETS,
+)
+external_request_duration = Histogram(
+    'marketkeys_external_request_duration_seconds', 'Horizon and assets tracker request latency.',
+    ['service', 'endpoint', 'status'],
+)
+external_request_retries = Counter(
+    'marketkeys_external_request_retries', 'Retried Horizon and assets tracker requests.',
+    ['service', 'endpoint'],
+)
+loader_rows = Counter(
+    'marketkeys_loader_rows', 'Rows created or updated by loaders.',
+    ['loader', 'operation'],
+)
+api_request_duration = Histogram(
+    'marketkeys_api_request_duration_seconds', 'Api request duration.',
+    ['route', 'status'],
+)
+api_cache_requests = Counter(
+    'marketkeys_api_cache_requests', 'Api response cache lookups, hit ratio is hit / (hit + miss).',
+    ['result'],
+)
+
+
+def get_registry() -> CollectorRegistry:
+    # Gunicorn and prefork celery workers write metrics to files in PROMETHEUS_MULTIPROC_DIR, collect all of them.
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries(scope: str, name: str):
+    query_counter = QueryCounter()
+    try:
+        with connection.execute_wrapper(query_counter):
+            yield query_counter
+    finally:
+        db_queries.labels(scope, name).observe(query_counter.count)
+
+
+@contextmanager
+def measure_task(task_name: str):
+    outcome = 'failure'
+    started_at = time.perf_counter()
+    try:
+        with count_queries('task', task_name):
+            yield
+
+        outcome = 'success'
+    finally:
+        task_duration.labels(task_name, outcome).observe(time.perf_counter() - started_at)
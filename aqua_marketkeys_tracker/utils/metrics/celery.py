@@ -0,0 +1,31 @@
+import os
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from celery import Task
+from prometheus_client import multiprocess, start_http_server
+
+from aqua_marketkeys_tracker.utils.metrics import get_registry, measure_task
+
+
+class MeasuredTask(Task):
+    def __call__(self, *args, **kwargs):
+        with measure_task(self.name):
+            return super(MeasuredTask, self).__call__(*args, **kwargs)
+
+
+def start_metrics_exporter(**kwargs):
+    if not settings.CELERY_METRICS_PORT:
+        return
+
+    # Tasks run in pool child processes, exporter of the main process sees their metrics only through files.
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        raise ImproperlyConfigured('PROMETHEUS_MULTIPROC_DIR is required to export celery metrics.')
+
+    start_http_server(settings.CELERY_METRICS_PORT, registry=get_registry())
+
+
+def mark_metrics_process_dead(pid: int, **kwargs):
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,23 @@
+import time
+
+from django.db import connection
+
+from aqua_marketkeys_tracker.utils.metrics import QueryCounter, api_request_duration, db_queries
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        query_counter = QueryCounter()
+        started_at = time.perf_counter()
+        with connection.execute_wrapper(query_counter):
+            response = self.get_response(request)
+
+        # Path is too granular for a label, route of the resolved view is used instead.
+        route = request.resolver_match.route if request.resolver_match else 'unresolved'
+        api_request_duration.labels(route, response.status_code).observe(time.perf_counter() - started_at)
+        db_queries.labels('request', route).observe(query_counter.count)
+
+        return response
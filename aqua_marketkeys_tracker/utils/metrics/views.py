@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from aqua_marketkeys_tracker.utils.metrics import get_registry
+
+
+def metrics_view(request):
+    if not settings.METRICS_TOKEN:
+        raise Http404
+
+    if not constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {settings.METRICS_TOKEN}'):
+        return HttpResponseForbidden()
+
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
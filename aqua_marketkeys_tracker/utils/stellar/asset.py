@@ -1,3 +1,5 @@
+from typing import Optional
+
 from stellar_sdk import Asset
 
 
@@ -8,6 +10,13 @@ def get_asset_string(asset: Asset) -> str:
     return f'{asset.code}:{asset.issuer}'
 
 
+def get_asset_string_by_parts(code: str, issuer: Optional[str]) -> str:
+    if not issuer:
+        return 'native'
+
+    return f'{code}:{issuer}'
+
+
 def parse_asset_string(asset_string: str) -> Asset:
     if asset_string == 'native':
         return Asset.native()
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from stellar_sdk import AiohttpClient, RequestsClient, Server, ServerAsync
+from stellar_sdk.client.response import Response
+from stellar_sdk.exceptions import ConnectionError
+
+from aqua_marketkeys_tracker.utils.metrics import external_request_duration, external_request_retries
+
+
+logger = logging.getLogger(__name__)
+
+
+HORIZON_POOL_SIZE = 10
+HORIZON_MAX_RETRIES = 4
+HORIZON_BACKOFF_BASE = 0.5
+HORIZON_BACKOFF_CAP = 30
+
+ENDPOINT_ID_REGEX = re.compile(r'^(G[A-Z2-7]{55}|\d+|[0-9a-f]{64})$')
+
+
+class HorizonRequestStats:
+    def __init__(self):
+        self.requests = Counter()
+        self.retries = Counter()
+        self.duration = defaultdict(float)
+
+    def reset(self):
+        self.requests.clear()
+        self.retries.clear()
+        self.duration.clear()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+
+request_stats = HorizonRequestStats()
+
+
+def is_transient_status(status_code: int) -> bool:
+    # Rate limits and server errors may pass on retry, other client errors are deterministic.
+    return status_code == 429 or status_code >= 500
+
+
+def get_endpoint_name(url: str) -> str:
+    return '/'.join(
+        ':id' if ENDPOINT_ID_REGEX.match(segment) else segment
+        for segment in urlparse(url).path.split('/')
+    ) or '/'
+
+
+class RetryPolicyMixin:
+    max_retries = HORIZON_MAX_RETRIES
+    backoff_base = HORIZON_BACKOFF_BASE
+    backoff_cap = HORIZON_BACKOFF_CAP
+
+    def should_retry(self, attempt: int, response: Optional[Response]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+
+        return response is None or is_transient_status(response.status_code)
+
+    def get_retry_delay(self, attempt: int, response: Optional[Response]) -> float:
+        retry_after = response and response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), self.backoff_cap)
+
+        # Full jitter exponential backoff.
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))  # noqa: S311
+
+    def record_request(self, url: str, status_code: Optional[int], duration: float, attempt: int):
+        endpoint = get_endpoint_name(url)
+        request_stats.requests[endpoint] += 1
+        request_stats.duration[endpoint] += duration
+        external_request_duration.labels('horizon', endpoint, status_code or 'error').observe(duration)
+        if attempt:
+            request_stats.retries[endpoint] += 1
+            external_request_retries.labels('horizon', endpoint).inc()
+
+        logger.debug('Horizon request %s finished with %s in %.3fs.', endpoint, status_code, duration)
+
+
+class ResilientRequestsClient(RetryPolicyMixin, RequestsClient):
+    def __init__(self, pool_size: int = HORIZON_POOL_SIZE, **kwargs):
+        # Retries are handled by the client itself to apply jitter and count them.
+        super(ResilientRequestsClient, self).__init__(pool_size=pool_size, num_retries=0, **kwargs)
+
+    def get(self, url: str, *args, **kwargs) -> Response:
+        attempt = 0
+        while True:
+            started_at = time.perf_counter()
+            try:
+                response = super(ResilientRequestsClient, self).get(url, *args, **kwargs)
+            except ConnectionError:
+                self.record_request(url, None, time.perf_counter() - started_at, attempt)
+                if not self.should_retry(attempt, None):
+                    raise
+                response = None
+            else:
+                self.record_request(url, response.status_code, time.perf_counter() - started_at, attempt)
+                if not self.should_retry(attempt, response):
+                    return response
+
+            time.sleep(self.get_retry_delay(attempt, response))
+            attempt += 1
+
+
+class ResilientAiohttpClient(RetryPolicyMixin, AiohttpClient):
+    async def get(self, url: str, *args, **kwargs) -> Response:
+        attempt = 0
+        while True:
+            started_at = time.perf_counter()
+            try:
+                response = await super(ResilientAiohttpClient, self).get(url, *args, **kwargs)
+            except ConnectionError:
+                self.record_request(url, None, time.perf_counter() - started_at, attempt)
+                if not self.should_retry(attempt, None):
+                    raise
+                response = None
+            else:
+                self.record_request(url, response.status_code, time.perf_counter() - started_at, attempt)
+                if not self.should_retry(attempt, response):
+                    return response
+
+            await asyncio.sleep(self.get_retry_delay(attempt, response))
+            attempt += 1
+
+
+_horizon_servers: Dict[str, Server] = {}
+
+
+def get_horizon_server(horizon_url: Optional[str] = None) -> Server:
+    # Servers are shared across tasks of the process to reuse keep-alive connections.
+    horizon_url = horizon_url or settings.HORIZON_URL
+    if horizon_url not in _horizon_servers:
+        _horizon_servers[horizon_url] = Server(horizon_url, client=ResilientRequestsClient())
+
+    return _horizon_servers[horizon_url]
+
+
+def get_horizon_server_async(horizon_url: Optional[str] = None, pool_size: int = HORIZON_POOL_SIZE) -> ServerAsync:
+    # Aiohttp sessions are bound to the event loop, so the async server is created per run.
+    horizon_url = horizon_url or settings.HORIZON_URL
+    return ServerAsync(horizon_url, client=ResilientAiohttpClient(pool_size=pool_size))
@@ -1,18 +1,55 @@
-def load_all_records(request_builder, start_cursor=None, page_size=200):
+import logging
+import time
+
+from stellar_sdk.exceptions import BaseHorizonError, ConnectionError
+
+from aqua_marketkeys_tracker.utils.stellar.horizon import is_transient_status
+
+
+logger = logging.getLogger(__name__)
+
+
+PAGE_RETRIES = 2
+PAGE_RETRY_DELAY = 5
+
+
+def is_transient_error(exc: Exception) -> bool:
+    return isinstance(exc, ConnectionError) or is_transient_status(exc.status)
+
+
+def load_all_pages(request_builder, start_cursor=None, page_size=200, page_retries=PAGE_RETRIES):
     base_request_builder = request_builder.limit(page_size)
     cursor = start_cursor
+    failed_attempts = 0
     while True:
         if cursor:
             request_builder = base_request_builder.cursor(cursor)
         else:
             request_builder = base_request_builder
 
-        response = request_builder.call()
+        try:
+            response = request_builder.call()
+        except (ConnectionError, BaseHorizonError) as exc:
+            # Client retries are exhausted. Resume from the last loaded page instead of failing whole scan.
+            if not is_transient_error(exc) or failed_attempts >= page_retries:
+                raise
+
+            failed_attempts += 1
+            logger.warning('Page loading failed, resuming from cursor %s.', cursor, exc_info=True)
+            time.sleep(PAGE_RETRY_DELAY * failed_attempts)
+            continue
+
+        failed_attempts = 0
         records = response['_embedded']['records']
 
-        for record in records:
-            yield record
-            cursor = record['paging_token']
+        if records:
+            yield records
+            cursor = records[-1]['paging_token']
 
         if len(records) < page_size:
             break
+
+
+def load_all_records(request_builder, start_cursor=None, page_size=200):
+    for records in load_all_pages(request_builder, start_cursor=start_cursor, page_size=page_size):
+        yield from records
@@ -48,6 +48,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 # --------------------------------------------------------------------------
 
 MIDDLEWARE = [
+    'aqua_marketkeys_tracker.utils.metrics.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -159,6 +160,24 @@ if CELERY_ENABLED:
     CELERY_TASK_IGNORE_RESULT = True
 
 
+# Metrics configuration
+# --------------------------------------------------------------------------
+
+# Bearer token prometheus sends to read api metrics at /metrics, endpoint is disabled if empty.
+METRICS_TOKEN = env('METRICS_TOKEN', default=None)
+
+# Port of prometheus metrics exporter started by celery worker, disabled if empty.
+CELERY_METRICS_PORT = env.int('CELERY_METRICS_PORT', default=None)
+
+
+# Cache configuration
+# --------------------------------------------------------------------------
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='redis://localhost:6379/0'),
+}
+
+
 # Rest framework configuration
 # http://www.django-rest-framework.org/api-guide/settings/
 # --------------------------------------------------------------------------
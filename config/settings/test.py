@@ -0,0 +1,10 @@
+from config.settings.dev import *  # noqa: F403
+
+
+# Cache configuration
+# --------------------------------------------------------------------------
+
+# Separate redis database, so tests don't touch api cache and task locks of development environment.
+CACHES = {
+    'default': env.cache('TEST_CACHE_URL', default='redis://localhost:6379/15'),
+}
@@ -2,6 +2,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import include, path, register_converter
 
+from aqua_marketkeys_tracker.utils.metrics.views import metrics_view
 from aqua_marketkeys_tracker.utils.stellar.urls import AssetStringConverter
 
 
@@ -10,6 +11,7 @@ register_converter(AssetStringConverter, 'asset_string')
 
 urlpatterns = [
     path('api/', include('aqua_marketkeys_tracker.marketkeys.urls')),
+    path('metrics', metrics_view),
 ]
 
 